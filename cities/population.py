@@ -15,36 +15,57 @@
 # limitations under the License.
 
 import os
+import re
 import json
 
 import numpy as np
 import pandas as pd
 import geopandas as gpd
 import matplotlib.pyplot as plt
+import shapely
 from shapely.geometry import shape
 
-from query import parse_page_information, clean_escape_sequences
+# Webpage parsing functions.
+from query import _fetch_page_tree
+from query import _FIRST_WIKITABLE_XPATH
+
+# Precompiled patterns for cleaning the city table cells.
+_FOOTNOTE_RE = re.compile(r'\[.*?\]')
+_NON_DIGIT_RE = re.compile(r'[^\d]')
 
 
 def plot_top_k_contiguous_us_city_populations(k = 50, savefig = True):
     # Read a map with U.S. state boundaries, and remove Alaska, Hawaii,
-    # and any territories, to conform to the contiguous U.S.
-    world = gpd.read_file('data/us-state-boundaries.csv')
-    world = world[~world.name.isin([
-        'Guam', 'American Samoa', 'United States Virgin Islands',
-        'Puerto Rico', 'Commonwealth of the Northern Mariana Islands',
-        'Alaska', 'Hawaii'])]
-
-    # Get the geometry of the states and create a new dataframe with them.
+    # and any territories, to conform to the contiguous U.S. The cleaned
+    # boundaries are cached to a parquet file after they are first built.
+    if not os.path.exists('data/us_states.parquet'):
+        world = gpd.read_file('data/us-state-boundaries.csv')
+        world = world[~world.name.isin([
+            'Guam', 'American Samoa', 'United States Virgin Islands',
+            'Puerto Rico', 'Commonwealth of the Northern Mariana Islands',
+            'Alaska', 'Hawaii'])]
+
+        # Get the geometry of the states and create a new dataframe with them.
+        try:
+            geometries = shapely.from_geojson(
+                world['St Asgeojson'].to_numpy(dtype = object))
+        except shapely.errors.GEOSException:
+            geometries = [shape(json.loads(x)) for x in world['St Asgeojson'].tolist()]
+        world = gpd.GeoDataFrame(
+            {'name': world.name, 'geometry': geometries, 'region': world.region})
+        world.to_parquet('data/us_states.parquet')
+    else:
+        world = gpd.read_parquet('data/us_states.parquet')
+
+    # Plot the states.
     fig, ax = plt.subplots(figsize = (20, 15))
-    geometries = [shape(json.loads(x)) for x in world['St Asgeojson'].tolist()]
-    world = gpd.GeoDataFrame(
-        {'name': world.name, 'geometry': geometries, 'region': world.region})
     ax = world.plot(ax = ax, edgecolor = 'black', column = 'region')
     ax.set_axis_off()
 
     # Read in the population data and create a geo dataframe.
-    df = pd.read_csv('data/us_cities_population_contiguous.csv')
+    df = pd.read_parquet(
+        'data/us_cities_population_contiguous.parquet',
+        columns = ['Name', 'State', 'Population', 'Latitude', 'Longitude'])
     gdf = gpd.GeoDataFrame(
         df, geometry = gpd.points_from_xy(df.Longitude, df.Latitude))
 
@@ -68,49 +89,39 @@ def plot_top_k_contiguous_us_city_populations(k = 50, savefig = True):
         fig.savefig(f'images/us_top_{k}_cities_population_contiguous.png')
 
 
-def us_city_population_processing_function(term):
-    # Get all of the page's HTML content.
-    soup = parse_page_information(term)
-
-    # Get the table with the list of cities.
-    info_table = soup.find_all('table', {'class': 'wikitable sortable'})[0]
-    info_table = info_table.find_all('tbody')[0]
-
-    # Compile together each of the tags which reference a city.
-    contents = np.array(info_table.find_all('td'), dtype = object)
-    contents = contents.reshape((-1, 10))
-
-    # Get all of the cities, their populations, and their location.
-    name, state, population, long, lat = [], [], [], [], []
-    for item in contents:
-        city_name = item[0].a.string
-        city_state = item[1].a.string
-        population_2020 = int(
-            clean_escape_sequences(item[2].string).replace(',', ''))
-        location = item[-1].find_all(
-            'span', {'class': 'geo'})[0].string.split('; ')
-        location = tuple([float(i) for i in location])
-
-        # Skip Alaska and Hawaii (only contiguous states).
-        if city_state.lower() in ['alaska', 'hawaii']:
+def parse_city_table(table):
+    """Parses the name, state, population, and location of each city in the city table.
+
+    Every column is read from the same data rows, so they always line up. The location
+    is read from the `<span class="geo">lat; long</span>` of each row, which is hidden on
+    the page. Rows without a population or a location (e.g. sub-headers) are skipped."""
+    cities = []
+    for row in table.xpath('.//tr[td]'):
+        # The cells of the row (the city name may be a <th> row header), with footnotes stripped.
+        cells = [_FOOTNOTE_RE.sub('', cell.text_content()).strip() for cell in row.xpath('./th|./td')]
+        geo = row.xpath('string(.//span[@class="geo"])').split(';')
+        if len(cells) < 4 or len(geo) != 2:
             continue
+        population = _NON_DIGIT_RE.sub('', cells[3])
+        if population == '':
+            continue
+        cities.append((cells[1], cells[2], int(population), float(geo[0]), float(geo[1])))
+    return pd.DataFrame(cities, columns = ['Name', 'State', 'Population', 'Latitude', 'Longitude'])
+
 
-        # Add the contents to the overall list.
-        name.append(city_name)
-        state.append(city_state)
-        population.append(population_2020)
-        lat.append(location[0])
-        long.append(location[1])
+def us_city_population_processing_function(term):
+    # Get the table with the list of cities (from the shared page tree), and parse it.
+    table = _FIRST_WIKITABLE_XPATH(_fetch_page_tree(term))[0]
+    df = parse_city_table(table)
 
-    # Create a DataFrame from the information.
-    df = pd.DataFrame({'Name': name, 'State': state,
-                       'Population': population,
-                       'Latitude': lat,
-                       'Longitude': long})
+    # Skip Alaska and Hawaii (only contiguous states).
+    df = df[~df['State'].str.lower().isin(['alaska', 'hawaii'])]
+    df = df.reset_index(drop = True)
 
     # Save the DataFrame.
     os.makedirs('data', exist_ok = True)
-    df.to_csv('data/us_cities_population_contiguous.csv')
+    df.to_parquet('data/us_cities_population_contiguous.parquet',
+                  compression = 'snappy')
 
 
 if __name__ == '__main__':
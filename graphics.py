@@ -22,45 +22,63 @@ directories for processing images and other related graphics.
 
 import os
 import logging
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 
 import cairo
 import cairosvg
 
+# Rust-backed SVG rasterization, if available (otherwise cairosvg is used).
+try:
+   import resvg_py
+except ImportError:
+   resvg_py = None
+
 
 # GRAPHICS CONVERSION METHODS:
 # Methods for converting graphic filetypes, notable instances include
 # svg to (png, jpg), since these are not possible through high-level libraries.
 
 
-def svg_to_png(*paths, delete = False):
-   """Converts a list of images from svg to png files."""
-   # Create a return list for future usage.
-   return_list = []
+def _svg_to_png_single(path, delete = False):
+   """Converts a single image from svg to png (run inside a worker process)."""
+   # Get the image name and create the final filepath.
+   filename, _ = os.path.splitext(path)
+   save_path = filename + ".png"
+
+   # Convert the image.
+   try:
+      if resvg_py is not None:
+         with open(save_path, 'wb') as save_file:
+            save_file.write(bytes(resvg_py.svg_to_bytes(svg_path = path)))
+      else:
+         cairosvg.svg2png(url = path, write_to = save_path)
+   except Exception as e:
+      raise Exception(f"Error while attempting to parse {filename}", e)
 
-   # Iterate over the provided paths.
-   for path in paths:
-      # Get the image name and create the final filepath.
-      filename, _ = os.path.splitext(path)
-      save_path = filename + ".png"
+   # Delete the original image if requested to.
+   if delete:
+      os.remove(path)
 
-      # Weird issues which sometimes arise.
-      if os.path.exists(save_path):
-         continue
+   # Return the new path.
+   return save_path
 
-      # Append the new path to the return list.
-      return_list.append(save_path)
 
-      # Convert the image.
-      try:
-         cairosvg.svg2png(url = path, write_to = save_path)
-      except Exception as e:
-         raise Exception(f"Error while attempting to parse {filename}", e)
-      finally:
-         del save_path
-
-      # Delete the original image if requested to.
-      if delete:
-         os.remove(path)
+def svg_to_png(*paths, delete = False):
+   """Converts a list of images from svg to png files."""
+   # Weird issues which sometimes arise: skip any images which have already
+   # been converted before dispatching them to the worker processes.
+   paths = [path for path in paths if not os.path.exists(convert_path_extension(path))]
+   if len(paths) == 0:
+      return []
+
+   # Convert the images in parallel, since each one is independent. The paths
+   # are split into one chunk per worker to amortize the inter-process overhead.
+   max_workers = os.cpu_count() or 1
+   chunksize = -(-len(paths) // max_workers)
+   with ProcessPoolExecutor(max_workers = max_workers) as executor:
+      return_list = list(executor.map(
+         _svg_to_png_single, paths, repeat(delete), chunksize = chunksize))
 
    # Return the return list.
    return return_list
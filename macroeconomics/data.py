@@ -15,17 +15,17 @@
 # limitations under the License.
 import os
 
-import numpy as np
 import pandas as pd
 
-df = pd.read_excel(os.path.join(os.path.dirname(__file__), 'data/mpd2020.xlsx'), sheet_name = 'Full data')
-unique = np.unique(df.country)
-for u in unique:
-   try:
-      print(u)
-      if df.loc[df['country'] == u]['year'].tolist()[0] == 1:
-         print(df.loc[df['country'] == u]['year'].tolist())
-         print(df.loc[df['country'] == u]['gdppc'].tolist())
-   except:
-      print('HELP!')
-
+# Convert the workbook to a feather file once, and read that on subsequent runs.
+cache_path = os.path.join(os.path.dirname(__file__), 'data/mpd2020.feather')
+if not os.path.exists(cache_path):
+   pd.read_excel(os.path.join(os.path.dirname(__file__), 'data/mpd2020.xlsx'),
+                 sheet_name = 'Full data').to_feather(cache_path)
+df = pd.read_feather(cache_path)
+for country, group in df.groupby('country'):
+   print(country)
+   years = group['year'].to_numpy()
+   if years[0] == 1:
+      print(years.tolist())
+      print(group['gdppc'].tolist())
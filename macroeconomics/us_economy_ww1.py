@@ -27,32 +27,23 @@ import matplotlib.pyplot as plt
 from matplotlib import style
 style.use('fivethirtyeight')
 
+# Construct the data first (scaled to a smaller range).
+YEARS = np.arange(1913, 1925)
+EXPORTS = np.array([2465884, 2412835, 2741177, 4317040,
+                    3521758, 3169633, 3844866, 3640715,
+                    3051041, 2571662, 2706164, 3060656], dtype = np.float64) / 1e6
+IMPORTS = np.array([1813008, 1932577, 1657594, 1883177,
+                    1668061, 1562480, 1895323, 2335611,
+                    1706903, 2089091, 2462380, 2406642], dtype = np.float64) / 1e6
+
 def build_us_import_export_graph(savefig = True):
    """Builds the U.S. imports/exports graph from 1913-1924."""
    # Construct the figure.
    fix, ax = plt.subplots(figsize = (10, 5))
 
-   # Construct the data first.
-   exports = [2465884, 2412835, 2741177, 4317040,
-              3521758, 3169633, 3844866, 3640715,
-              3051041, 2571662, 2706164, 3060656]
-   imports = [1813008, 1932577, 1657594, 1883177,
-              1668061, 1562480, 1895323, 2335611,
-              1706903, 2089091, 2462380, 2406642]
-
-   # Scale to a smaller range.
-   exports = [item / 1e6 for item in exports]
-   imports = [item / 1e6 for item in imports]
-
    # Plot the data.
-   plt.plot(
-      np.arange(1913, len(exports) + 1913, 1),
-      np.array(exports), color = 'tab:cyan',
-      label = 'Exports')
-   plt.plot(
-      np.arange(1913, len(imports) + 1913, 1),
-      np.array(imports), color = 'tab:green',
-      label = 'Imports')
+   plt.plot(YEARS, EXPORTS, color = 'tab:cyan', label = 'Exports')
+   plt.plot(YEARS, IMPORTS, color = 'tab:green', label = 'Imports')
 
    # Add the plot title.
    plt.suptitle(
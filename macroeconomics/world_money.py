@@ -14,112 +14,122 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
+import os
 import re
-
-import wikipedia as wk
+from functools import lru_cache
 
 # For figure development.
 import numpy as np
+import pandas as pd
 from matplotlib import style
 style.use('seaborn-darkgrid')
 import matplotlib.pyplot as plt
 
-# Webpage parsing functions.
-import requests
-from bs4 import BeautifulSoup
+from query import _SESSION
+from query import BASE_WIKI_URL
+from query import InformationLoader
 
+# Precompiled patterns for parsing the GWP table.
+_RE_BC_CUTOFF = re.compile('\\d{2,3},\\d{3}\\sBC')
+_RE_LINKS = re.compile('\\[(.*?)\\]')
+_RE_PARENTHESIS = re.compile('\\((.*?)\\)')
+_RE_ERA_SPACING = re.compile('(\\d{1,4})(AD|BC)')
+_RE_ERA_DOTS = re.compile('([AB])([DC])')
 
-def get_gwp_data():
-   """Gets gross world product (GWP) data and returns a list over time."""
-   # Construct webpage.
-   page = requests.get(wk.page('Gross World Product', auto_suggest = False).url)
-   soup = BeautifulSoup(page.content, 'html.parser')
 
-   # Construct return dict of GWP data.
-   gwp_data = {}
+def _clean(column):
+   """Cleans a column of GWP table cells of links, parenthesis, commas, and spaces."""
+   # Parse the items for links, parenthesis, commas, and spaces.
+   column = column.str.replace(_RE_LINKS, '', regex = True)
+   column = column.str.replace(_RE_PARENTHESIS, '', regex = True)
+   column = column.str.replace(',', '', regex = False).str.replace(' ', '', regex = False)
 
-   # Parse main table content.
-   # We need the second table.
-   table = soup.find_all('table', class_= re.compile('wikitable'))[1]
-   for row in table.find_all('tr'):
-      # Create a candidate list.
-      _candidate_list = []
+   # Reintroduce the space between the number and "AD"/"BC", and add dots.
+   column = column.str.replace(_RE_ERA_SPACING, '\\1 \\2', regex = True)
+   return column.str.replace(_RE_ERA_DOTS, '\\1.\\2.', regex = True)
 
-      # Parse over each row.
-      for indx, item in enumerate(row.find_all('td')):
-         # Notable instances which need to be skipped.
-         if item.text.strip() in ['Sources:']:
-            continue
 
-         # Skip any data past 9999 BC, since the 'world's economy'
-         # back then wasn't really existent, and is therefore unnecessary
-         # since all data is basically extreme predictions.
-         if len(re.findall('\\d{2,3},\\d{3}\\sBC', item.text.strip())) > 0:
-            break
+def parse_gwp_data():
+   """Parses gross world product (GWP) data from Wikipedia and returns a list over time."""
+   # Construct webpage (the page URL is requested directly, rather than
+   # resolved through the Wikipedia API, to save a round-trip).
+   page = _SESSION.get(BASE_WIKI_URL + 'Gross_world_product', timeout = 10)
 
-         # Parse the item for links, parenthesis, commas, and spaces.
-         parsed_item = re.sub('\\[(.*?)\\]', '', item.text.strip())
-         parsed_item = re.sub('\\((.*?)\\)', '', parsed_item)
-         parsed_item = re.sub(',', '', parsed_item)
-         parsed_item = re.sub(' ', '', parsed_item)
+   # Parse main table content. We need the (historical) table which reaches back into the BC
+   # years, which is selected by matching those years while the page is parsed, in a single pass.
+   table = pd.read_html(io.StringIO(page.text), match = _RE_BC_CUTOFF)[0]
+   return _parse_gwp_table(table)
 
-         # Reintroduce the space between the number and "AD"/"BC", and add dots.
-         parsed_item = re.sub('(\\d{1,4})(AD|BC)', '\\1 \\2', parsed_item)
-         parsed_item = re.sub('([AB])([DC])', '\\1.\\2.', parsed_item)
 
-         # Get the year.
-         if indx == 0:
-            # Add the month and day (Jan 1) to ease SpiceyPy in parsing.
-            _candidate_list.append(parsed_item)
+def _parse_gwp_table(table):
+   """Parses the (historical) GWP table into a dictionary of GWP by year, from earliest to latest."""
+   years = table.iloc[:, 0].astype(str).str.strip()
+   gwp = table.iloc[:, 1].astype(str).str.strip()
 
-         # Get the total GWP.
-         if indx == 1:
-            _candidate_list.append(float(parsed_item))
+   # Skip any data past 9999 BC, since the 'world's economy'
+   # back then wasn't really existent, and is therefore unnecessary
+   # since all data is basically extreme predictions. Also skip
+   # notable instances, such as the source rows.
+   keep = ~years.str.contains(_RE_BC_CUTOFF) & (years != 'Sources:')
 
-      # Add the items in the candidate list to the GWP data dict.
-      if len(_candidate_list) == 2:
-         gwp_data[_candidate_list[0]] = _candidate_list[1]
+   # Clean the years and the total GWP.
+   years = _clean(years[keep])
+   gwp = pd.to_numeric(_clean(gwp[keep]), errors = 'coerce')
+   valid = gwp.notna()
 
-   # Reverse the dictionary.
-   _return_dict = {}
-   for key, value in zip(reversed(list(gwp_data.keys())), reversed(list(gwp_data.values()))):
-      _return_dict[key] = value
+   # Construct the GWP data dict.
+   gwp_data = dict(zip(years[valid], gwp[valid].astype(float)))
 
-   # Return the data.
-   return _return_dict
+   # Return the data (reversed, to go from earliest to latest).
+   return dict(reversed(gwp_data.items()))
 
 
-# Construct the world's GWP data.
-world_gwp_data = get_gwp_data()
+# Construct the information loader for GWP data.
+class GWPInformationLoader(InformationLoader):
+   def process_function(self):
+      """Constructs a dictionary containing the world's GWP data."""
+      return parse_gwp_data()
 
+@lru_cache(maxsize = 1)
+def get_gwp_data():
+   """Gets gross world product (GWP) data, either from the saved file or by parsing it."""
+   save_location = os.path.join(os.path.dirname(__file__), 'data', 'gwp_data.pickle')
+   os.makedirs(os.path.dirname(save_location), exist_ok = True)
+   with GWPInformationLoader(save_location = save_location) as data:
+      return data
 
-def convert_years_to_scale(data):
-   """Converts the actual years in B.C./A.D. to a scale usable in a plot."""
-   # Get the years.
-   return {key: value for key, value in zip(data.keys(), range(len(data.keys())))}
+
+def __getattr__(name):
+   # Construct the world's GWP data lazily, rather than at import.
+   if name == 'world_gwp_data':
+      return get_gwp_data()
+   raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def plot_world_gwp_trend(savefig = True):
    """Plots the world GWP over a period of ~10,000 years."""
+   # Get the world's GWP data.
+   world_gwp_data = get_gwp_data()
+
    # Construct the figure.
    fig, ax = plt.subplots(figsize = (20, 5))
 
    # Construct mappings between a plottable x- and y- axis.
-   x_axis_data = np.array(list(convert_years_to_scale(world_gwp_data).values()))
+   x_axis_data = np.arange(len(world_gwp_data))
    y_axis_data = np.array(list(world_gwp_data.values()))
 
    # Plot the x- and y- axis data.
    ax.plot(x_axis_data, y_axis_data)
 
    # Change the x-axis labels.
-   plt.xticks(x_axis_data, list(convert_years_to_scale(world_gwp_data).keys()),
+   plt.xticks(x_axis_data, list(world_gwp_data.keys()),
               fontsize = 10,  rotation = 45)
 
    # Final configurations of the plot.
    plt.title("$\\bf{World\\,\\:GDP\\,\\:Over\\,\\:10,000\\,\\:Years}$")
 
    # Display the plot.
-   fig = plt.gcf()
    plt.show()
 
    # Save the figure.
@@ -4,9 +4,9 @@ import os
 import re
 import json
 import shutil
+from functools import lru_cache
 
 import datetime
-import dateutil.relativedelta
 import wikipedia as wk
 
 import requests
@@ -21,55 +21,51 @@ style.use('seaborn-deep')
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
-from nations.info import founding_dates
+from nations.info import get_founding_dates as _get_founding_date_strings
 
 def convert_dates_to_date_objects(date_dict):
    """Converts founding dates into datetime objects."""
-   # Construct returnable dictionary.
-   return_dict = {}
-
-   # Iterate over dictionary.
-   for key, value in date_dict.items():
-      # Convert string date into datetime object.
-      date = datetime.datetime.strptime(value, '%Y')
-
-      # Append date object to new dictionary.
-      return_dict[key] = date
+   # Convert all of the string dates into datetime objects at once.
+   dates = np.array(list(date_dict.values()), dtype = 'datetime64[Y]')
+   dates = dates.astype('datetime64[us]').astype(object)
 
    # Return dictionary.
-   return return_dict
+   return dict(zip(date_dict.keys(), dates))
+
+@lru_cache(maxsize = 1)
+def get_founding_dates():
+   """Gets the founding dates of each nation as datetime objects."""
+   return convert_dates_to_date_objects(_get_founding_date_strings())
 
-# Construct object holding date information.
-founding_dates = convert_dates_to_date_objects(founding_dates)
+def __getattr__(name):
+   # Construct object holding date information lazily, rather than at import.
+   if name == 'founding_dates':
+      return get_founding_dates()
+   raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_nation_founding_timeline(dates, save_figure = True):
    """Creates a timeline figure showing the founding of each country."""
-   # Create levels (e.g. the length of the lines showing dates).
-   levels = np.tile([-9, 9, -7, 7, -5, 5, -3, 3, -1, 1],
-                    int(np.ceil(len(dates.keys())/10)))[:len(dates.keys())]
+   # Create levels (e.g. the length of the lines showing dates), with
+   # placeholder levels of 0 at the start and end of the timeline.
+   levels = np.zeros(len(dates) + 2, dtype = int)
+   levels[1:-1] = np.resize([-9, 9, -7, 7, -5, 5, -3, 3, -1, 1], len(dates))
 
-   # Create list of names and dates.
+   # Create list of names and array of dates.
    names = list(dates.keys())
-   nation_dates = list(dates.values())
+   founding_years = np.array(list(dates.values()), dtype = 'datetime64[Y]')
 
    # Extend the graph to 20 years before the earliest nation and either
    # 20 years past the latest nation or to today, if it is that recent.
    # Get the date 20 years before the founding of the earliest nation.
-   earliest_date = min(dates.values()) + dateutil.relativedelta.relativedelta(years = -20)
+   earliest_date = founding_years.min() - np.timedelta64(20, 'Y')
    # Get the date 20 years after the founding of the latest nation or today's date.
-   if datetime.datetime.today().year - max(dates.values()).year < 20:
-      latest_date = datetime.datetime.strptime(str(datetime.datetime.today().year), '%Y')
-   else:
-      latest_date = max(dates.values()) + dateutil.relativedelta.relativedelta(years = +20)
+   current_year = np.datetime64(datetime.date.today(), 'Y')
+   latest_date = min(founding_years.max() + np.timedelta64(20, 'Y'), current_year)
 
    # Add today's date and the year 1720 to dates.
-   nation_dates.append(latest_date); nation_dates.insert(0, earliest_date)
+   nation_dates = np.concatenate(([earliest_date], founding_years, [latest_date]))
    # Add placeholder values to names.
    names.append(0); names.insert(0, 0)
-   # Add placeholders to levels.
-   levels = [item for item in levels]
-   levels.append(0); levels.insert(0, 0)
-   levels = np.array(levels, dtype = int)
 
    # Setup timeline figure.
    fig, ax = plt.subplots(figsize = (50, 6))
@@ -78,12 +74,15 @@ def create_nation_founding_timeline(dates, save_figure = True):
 
    # Plot the vertical lines.
    ax.vlines(nation_dates, 0, levels, color = 'tab:cyan')
-   ax.plot(nation_dates, np.zeros_like(nation_dates), "-o", color = "k", markerfacecolor = "w")
+   ax.axhline(0, color = "k", linewidth = 1)
+   ax.scatter(nation_dates, np.zeros(len(nation_dates)), marker = "o",
+              facecolor = "w", edgecolor = "k", zorder = 3)
    
    # Annotate the lines with the nation names.
+   text_offsets = np.sign(levels) * 3
    for number, (date, level, name) in enumerate(zip(nation_dates, levels, names)):
       ax.annotate(name, xy = (date, level),
-                  xytext = (-3, np.sign(level) * 3),
+                  xytext = (-3, text_offsets[number]),
                   textcoords = 'offset points',
                   horizontalalignment = 'center',
                   verticalalignment = 'bottom' if level > 0 else 'top',
@@ -101,10 +100,9 @@ def create_nation_founding_timeline(dates, save_figure = True):
 
    # Display plot.
    ax.margins(y = 0.1)
-   savefig = plt.gcf()
    plt.show()
 
    # Save figure.
    if save_figure:
-      savefig.savefig('images/nation-founding-timeline.png')
+      fig.savefig('images/nation-founding-timeline.png')
 
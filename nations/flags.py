@@ -3,6 +3,7 @@
 import os
 import copy
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 
@@ -13,14 +14,18 @@ style.use('seaborn-deep')
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 
-from nations.info import nation_flag_info
-from nations.info import founding_dates
+from nations.info import get_nation_flag_info
 
 # Helper methods to assist in actual figure development.
 
+def _read_flag_image(path):
+   """Reads a flag image from its path (in RGB format)."""
+   # Flip the BGR channels to RGB with a view, rather than a full image copy.
+   return cv2.imread(path)[..., ::-1]
+
 def get_country_flag(country):
    """Returns the corresponding flag of a provided country."""
-   with nation_flag_info as flag_path_info:
+   with get_nation_flag_info() as flag_path_info:
       # Validate the provided nation string.
       if country.title().replace('_', ' ') not in flag_path_info.keys() and \
          country.title().replace(' ', '_') not in flag_path_info.keys() and \
@@ -28,41 +33,47 @@ def get_country_flag(country):
          raise ValueError(f"Received invalid nation {country}, try another one.")
 
       # Read the flag image path and return the flag image.
-      return cv2.cvtColor(cv2.imread(flag_path_info[country.replace(' ', '_')]), cv2.COLOR_BGR2RGB)
+      return _read_flag_image(flag_path_info[country.replace(' ', '_')])
+
+def _read_flag_tile(path, size = (192, 128), padding = ((40, 8), (8, 8))):
+   """Reads a flag image resized to a uniform tile, padded with white space for a title."""
+   tile = cv2.resize(cv2.imread(path), size)[..., ::-1]
+   return np.pad(tile, (*padding, (0, 0)), constant_values = 255)
 
 # Actual figure development methods.
 
 def plot_flag_diagram():
    """Creates a plot showing the flags of each nation of the world."""
    # Create the figure.
-   fig, ax = plt.subplots(8, 23, figsize = (20, 20))
+   fig, ax = plt.subplots(figsize = (20, 20))
 
-   # Plot the actual images onto the figure.
-   with nation_flag_info as info:
-      # Generate a list of nations.
+   # Generate a list of nations and read all of their flags as uniform tiles.
+   # The images are read in parallel, since cv2 releases the GIL while decoding.
+   with get_nation_flag_info() as info:
       countries = list(info.keys())
-      
-      # Display each individual image.
-      tracker = 0
-      for i in range(8):
-         for j in range(23):
-            # Plot the image.
-            ax[i][j].imshow(get_country_flag(countries[tracker]))
-            ax[i][j].axis('off')
-
-            # Add the image title.
-            if len(countries[tracker]) < 12:
-               ax[i][j].set_title(countries[tracker], fontsize = 10)
-            elif 12 < len(countries[tracker]) < 20:
-               ax[i][j].set_title(countries[tracker], fontsize = 8)
-            else:
-               ax[i][j].set_title(countries[tracker], fontsize = 6)
-
-            # Increment the tracker.
-            tracker += 1
+      flag_paths = [info[country.replace(' ', '_')] for country in countries]
+   with ThreadPoolExecutor(max_workers = 8) as executor:
+      flag_tiles = list(executor.map(_read_flag_tile, flag_paths))
+
+   # Tile the flags into a single 8 x 23 mosaic, and display it with a single image.
+   mosaic = np.block([[[flag_tiles[i * 23 + j]] for j in range(23)] for i in range(8)])
+   ax.imshow(mosaic, interpolation = 'nearest')
+   ax.set_axis_off()
+
+   # Add the image titles above each of the flags.
+   tile_height, tile_width = flag_tiles[0].shape[:2]
+   for tracker, country in enumerate(countries[:8 * 23]):
+      i, j = divmod(tracker, 23)
+      if len(country) < 12:
+         fontsize = 10
+      elif 12 < len(country) < 20:
+         fontsize = 8
+      else:
+         fontsize = 6
+      ax.text(j * tile_width + tile_width / 2, i * tile_height + 30, country,
+              fontsize = fontsize, horizontalalignment = 'center')
 
    # Display the plot.
-   fig.subplots_adjust(bottom = 0, top = 0.1, wspace = 0.1, hspace = 0.1)
    fig.tight_layout()
    plt.show()
 
@@ -2,9 +2,11 @@
 # -*- coding = utf-8 -*-
 import os
 import re
-import json
-import tqdm
+import glob
 import shutil
+import asyncio
+import functools
+import itertools
 import wikipedia as wk
 
 # Country parsing functions.
@@ -12,35 +14,59 @@ import pycountry as pc
 
 # Webpage parsing functions.
 import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import lxml.html
+from tqdm.asyncio import tqdm_asyncio
 
 from query import process_page
+from query import _page_revision_id
+from query import _SUPPORTED_LIST_HANDLERS
 from query import is_valid_country
 from query import InformationLoader
-from query import BASE_WIKI_REQUEST_URL
+from query import BASE_WIKI_API_URL
 from query import get_base_path_name
 
 from graphics import svg_to_png
 from graphics import convert_path_extension
 
+# Precompiled patterns for parsing nation data.
+_DIGIT_RE = re.compile(r'\d')
+_NBSP_RE = re.compile('\xa0')
+_BRACKETS_RE = re.compile('\\[(.*?)\\]')
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7F]+')
+_YEAR_RE = re.compile('\\d{4}')
+_BASENAME_RE = re.compile('([^/]*)$')
+
+# Size of the chunks in which flag images are streamed to disk.
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# The saved nation data, and the Wikipedia page which the founding dates are parsed from.
+_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+_FOUNDING_DATES_PAGE = _SUPPORTED_LIST_HANDLERS['sovereign states formation']
+
+# Flag image names which need to be manually replaced.
+_FLAG_NAME_OVERRIDES = {'Flag_of_East_Timor.svg': 'Flag_of_Timor-Leste.svg'}
+
 def nation_founding_date_processing_function(term):
    """The nation founding date list (for usage in the list_of_items method)."""
    # Construct webpage.
    page = requests.get(wk.page(term).url)
-   soup = BeautifulSoup(page.content, 'html.parser')
+   tree = lxml.html.fromstring(page.content)
 
    # Create the dictionary of dates.
    founding_dates = {}
 
-   # Create a tracker list of nations to see what has already been found.
+   # Create a tracker list of nations to see what has already been found (along
+   # with a set of the same nations, for constant-time membership checks).
    _nation_tracker = []
+   _nation_tracker_set = set()
    _date_tracker = []
 
-   # Find all rows within tables containing nation data.
-   tables = soup.find_all('tr')
+   # Find all rows within tables containing nation data (skipping header rows).
+   tables = tree.xpath('//tr[.//td]')
    for table in tables:
       # Search for <td> tags containing actual data.
-      data_values = table.find_all('td')
+      data_values = table.xpath('.//td')
 
       # Tracker for determining whether a nation has been parsed yet, and
       # if so, then we need to determine the date.
@@ -48,14 +74,9 @@ def nation_founding_date_processing_function(term):
 
       # Iterate over the discovered values and determine if each is a country.
       for indx, value in enumerate(data_values):
-         # Get the text from the value.
-         current_value = value.text.split('\n')
-         _current_tracker = current_value.copy()
-
-         # Remove blank spaces.
-         for val in _current_tracker:
-            if val == '':
-               current_value.remove(val)
+         # Get the text from the value (removing blank spaces). Only the first
+         # non-blank line is ever used, so stop splitting once it is found.
+         current_value = list(itertools.islice((val for val in value.text_content().splitlines() if val), 1))
 
          # If we have already found a nation.
          if is_nation:
@@ -68,7 +89,7 @@ def nation_founding_date_processing_function(term):
                try:
                   # Sometimes, the second column might contain a continent
                   # rather than a date. So, we determine if it is.
-                  _is_potential_continent = bool(re.search(r'\d', current_value[0]))
+                  _is_potential_continent = bool(_DIGIT_RE.search(current_value[0]))
                   if _is_potential_continent:
                      _date_tracker.append(current_value[0])
                      break
@@ -86,7 +107,7 @@ def nation_founding_date_processing_function(term):
                try:
                   # Sometimes, the third column might contain a continent
                   # rather than a date. So, we determine if it is.
-                  _is_potential_continent = re.findall('\\d', current_value[0])
+                  _is_potential_continent = _DIGIT_RE.findall(current_value[0])
                   if len(_is_potential_continent) > 0:
                      _date_tracker.append(current_value[0])
                      break
@@ -109,22 +130,24 @@ def nation_founding_date_processing_function(term):
             break
 
          # Extract the potential nation from the list.
-         potential_nation = re.sub('\xa0', '', current_value[0]).strip()
-         potential_nation = re.sub('\\[(.*?)\\]', '', potential_nation)
-         potential_nation = re.sub(r'[^\x00-\x7F]+', '', potential_nation)
+         potential_nation = _NBSP_RE.sub('', current_value[0]).strip()
+         potential_nation = _BRACKETS_RE.sub('', potential_nation)
+         potential_nation = _NON_ASCII_RE.sub('', potential_nation)
 
          # Parse the value for a country.
-         if is_valid_country(potential_nation.strip()):
+         _stripped_nation = potential_nation.strip()
+         if is_valid_country(_stripped_nation):
             # Break if nation is already discovered.
-            if potential_nation in _nation_tracker:
+            if potential_nation in _nation_tracker_set:
                break
             else: # Otherwise, add to the tracker.
                # Manual case which we need to account for.
-               if potential_nation.strip() == 'Cabo Verde':
+               if _stripped_nation == 'Cabo Verde':
                   potential_nation = 'Cape Verde'
 
                # Add potential nation to nation tracker.
                _nation_tracker.append(potential_nation)
+               _nation_tracker_set.add(potential_nation)
                is_nation = potential_nation
 
       # Return nation tracker back to False.
@@ -137,7 +160,7 @@ def nation_founding_date_processing_function(term):
       
       # Get the year from the provided date.
       try:
-         _founding_date = re.findall('\\d{4}', date)[0]
+         _founding_date = _YEAR_RE.findall(date)[0]
       except IndexError as ie:
          raise ie
 
@@ -147,8 +170,36 @@ def nation_founding_date_processing_function(term):
    # Return the complete dictionary.
    return founding_dates
 
-# Construct the list of dates.
-founding_dates = process_page('sovereign states formation', processing_function = nation_founding_date_processing_function)
+# Construct the information loader for nation founding dates.
+class NationFoundingDateInformationLoader(InformationLoader):
+   def process_function(self):
+      """Constructs a dictionary containing the founding date of each nation."""
+      return process_page('sovereign states formation', processing_function = nation_founding_date_processing_function)
+
+@functools.lru_cache(maxsize = 1)
+def get_founding_dates():
+   """Gets the founding date of each nation, either from the saved file or by parsing it. The saved
+   file is keyed on the revision of the Wikipedia page, so the dates are re-parsed once it is edited."""
+   os.makedirs(_DATA_DIR, exist_ok = True)
+   saved_locations = glob.glob(os.path.join(_DATA_DIR, 'founding_dates_r*.pickle'))
+   try:
+      revision = _page_revision_id(_FOUNDING_DATES_PAGE)
+   except requests.RequestException:
+      # Without a connection to Wikipedia, fall back to the previously saved dates.
+      if len(saved_locations) == 0:
+         raise
+      save_location = max(saved_locations, key = os.path.getmtime)
+   else:
+      save_location = os.path.join(_DATA_DIR, f'founding_dates_r{revision}.pickle')
+
+      # Remove the dates saved from earlier revisions of the page.
+      for saved_location in saved_locations:
+         if saved_location != save_location:
+            os.remove(saved_location)
+
+   # Construct the list of dates.
+   with NationFoundingDateInformationLoader(save_location = save_location) as data:
+      return data
 
 # Construct the information loader for nation flags.
 class NationFlagInformationLoader(InformationLoader):
@@ -162,102 +213,128 @@ class NationFlagInformationLoader(InformationLoader):
                               "set the dictionary as an external class attribute before using it.")
 
       # Get a list of existing images.
-      svg_images = []
-      png_images = []
-      for item in os.listdir(storage_dir):
-         if item.endswith('.svg'):
-            svg_images.append(os.path.join(storage_dir, item))
-         if item.endswith('.png'):
-            png_images.append(os.path.join(storage_dir, item))
+      svg_images, png_images = self._scan_storage()
 
       # Determine if png or svg images already exist.
       # If so, orchestrate the necessary processing steps.
       if len(png_images) == len(self.founding_dates.keys()):
          # The png images already exist, so everything has been processed.
-         self.data = [os.path.join(storage_dir, image) for image in png_images]
+         self.data = png_images
          return self.data
       elif len(svg_images) == len(self.founding_dates.keys()):
          # If the svg images exist but not the png images, then just process the png images.
          # But first, remove the png images.
-         for image in [os.path.join(storage_dir, image) for image in png_images]:
+         for image in png_images:
             os.remove(image)
-         return self.convert_images()
+         return self.convert_images(svg_images, [])
       else:
          # Otherwise, remove all existing png/svg images and re-process.
-         for image in [os.path.join(storage_dir, image) for image in svg_images]:
-            os.remove(image)
-         for image in [os.path.join(storage_dir, image) for image in png_images]:
+         for image in svg_images + png_images:
             os.remove(image)
          return self.download_images()
 
+   def _scan_storage(self):
+      """Lists the svg and png images in the storage directory, in a single pass."""
+      svg_images = []
+      png_images = []
+      with os.scandir(self.storage_dir) as entries:
+         for entry in entries:
+            if entry.name.endswith('.svg'):
+               svg_images.append(entry.path)
+            elif entry.name.endswith('.png'):
+               png_images.append(entry.path)
+      return svg_images, png_images
+
    def download_images(self):
       """Stage 1 of self.process_function, downloads the svg files containing flag images."""
-      # Construct the return list.
-      link_list = []
-
-      # Iterate over each nation.
-      for nation in tqdm.tqdm(list(self.founding_dates.keys())):
-         # Some pages are odd, so we need to manually parse for certain keywords.
-         if nation == 'Ireland':
-            nation = 'Republic of Ireland'
-         if nation == 'Georgia':
-            nation = 'Georgia (country)'
-
-         # Parse for page data.
-         try:
-            url = wk.page(nation, auto_suggest = False).url
-         except wk.DisambiguationError as wkd:
-            raise wkd
-
-         nation_name = list(item.group() for item in re.finditer('([^/]*)$', url))[0]
-
-         # Get the image link.
-         base_page_data = requests.get(BASE_WIKI_REQUEST_URL + nation_name)
-         json_page_data = json.loads(base_page_data.text)
-
-         # Return the image source.
-         link_list.append(list(json_page_data['query']['pages'].values())[0]['original']['source'])
-
-      # A tracker to ensure that nations which have names which contain the names of
-      # other nations are not duplicated in the final list of links.
-      _nation_tracker = []
-
-      # Parse through links and download the image.
-      for link in link_list:
-         # Get the image from source.
-         response = requests.get(link, stream = True)
-
-         # Save the image to a local image file.
-         nation_name = list(item.group() for item in re.finditer('([^/]*)$', link))[0]
-         for nation in self.founding_dates.keys():
-            # Manual replacement for certain countries.
-            if nation_name == 'Flag_of_East_Timor.svg':
-               nation_name = 'Flag_of_Timor-Leste.svg'
-
-            # Regular parsing check.
-            if nation.replace(' ', '_') in nation_name and nation.replace(' ', '_') not in _nation_tracker:
-               nation_name = nation.replace(' ', '_')
-               _nation_tracker.append(nation_name)
-               break
-
-         nation_file_name = nation_name + '.svg' if str(link).endswith('.svg') else nation_name + '.png'
-         with open(os.path.join(self.storage_dir, nation_file_name), 'wb') as write_file:
-            write_file.write(response.content)
+      # Download the images concurrently, since this is entirely network-bound.
+      asyncio.run(self._download_images_async())
 
       # Return the complete list.
       return self.convert_images()
 
-   def convert_images(self):
+   async def _download_images_async(self, max_concurrent_requests = 10):
+      """Downloads the flag images of each nation, with a limited number of concurrent requests."""
+      semaphore = asyncio.Semaphore(max_concurrent_requests)
+      async with aiohttp.ClientSession() as session:
+         # Get the image link of each nation.
+         link_list = await tqdm_asyncio.gather(
+            *[self._fetch_image_link(session, semaphore, nation)
+              for nation in self.founding_dates.keys()])
+
+         # A tracker to ensure that nations which have names which contain the names of
+         # other nations are not duplicated in the final list of links.
+         _nation_tracker = set()
+
+         # Map the underscored representation of each nation to the nation, and keep a list
+         # of the underscored names with the longest first, so that e.g. 'Equatorial_Guinea'
+         # is matched before 'Guinea' when falling back to a substring search.
+         underscore_to_nation = {nation.replace(' ', '_'): nation for nation in self.founding_dates.keys()}
+         underscored_nations = sorted(underscore_to_nation, key = len, reverse = True)
+
+         # Parse through links and get the local image file names.
+         file_paths = []
+         for link in link_list:
+            nation_name = _BASENAME_RE.search(link).group()
+
+            # Manual replacement for certain countries.
+            nation_name = _FLAG_NAME_OVERRIDES.get(nation_name, nation_name)
+
+            # Regular parsing check, first for an exact match and otherwise for a substring.
+            stripped_name = os.path.splitext(nation_name)[0].replace('Flag_of_', '', 1)
+            if stripped_name in underscore_to_nation and stripped_name not in _nation_tracker:
+               nation_name = stripped_name
+               _nation_tracker.add(nation_name)
+            else:
+               for underscored_nation in underscored_nations:
+                  if underscored_nation in nation_name and underscored_nation not in _nation_tracker:
+                     nation_name = underscored_nation
+                     _nation_tracker.add(nation_name)
+                     break
+
+            nation_file_name = nation_name + '.svg' if str(link).endswith('.svg') else nation_name + '.png'
+            file_paths.append(os.path.join(self.storage_dir, nation_file_name))
+
+         # Download each of the images.
+         await asyncio.gather(
+            *[self._download_image(session, semaphore, link, path)
+              for link, path in zip(link_list, file_paths)])
+
+   @staticmethod
+   async def _fetch_image_link(session, semaphore, nation):
+      """Gets the source link of the flag image on a nation's Wikipedia page."""
+      # Some pages are odd, so we need to manually parse for certain keywords.
+      if nation == 'Ireland':
+         nation = 'Republic of Ireland'
+      if nation == 'Georgia':
+         nation = 'Georgia (country)'
+
+      async with semaphore:
+         # Parse for page data, resolving the page title and getting its image in one request.
+         async with session.get(BASE_WIKI_API_URL, params = {
+               'action': 'query', 'prop': 'pageimages', 'piprop': 'original',
+               'redirects': 1, 'format': 'json', 'titles': nation}) as response:
+            json_page_data = await response.json(content_type = None)
+
+      # Return the image source.
+      return list(json_page_data['query']['pages'].values())[0]['original']['source']
+
+   @staticmethod
+   async def _download_image(session, semaphore, link, path):
+      """Downloads an image from its source link to a local image file."""
+      async with semaphore:
+         async with session.get(link) as response:
+            # Stream the body straight to disk, rather than reading it all into memory.
+            response.raise_for_status()
+            with open(path, 'wb') as write_file:
+               async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                  write_file.write(chunk)
+
+   def convert_images(self, svg_images = None, png_images = None):
       """Stage 2 of self.process_function, converts the svg files to png files."""
-      # Get a list of existing images.
-      svg_images = []
-      for item in os.listdir(self.storage_dir):
-         if item.endswith('.svg'):
-            svg_images.append(os.path.join(self.storage_dir, item))
-      png_images = []
-      for item in os.listdir(self.storage_dir):
-         if item.endswith('.png'):
-            png_images.append(os.path.join(self.storage_dir, item))
+      # Get a list of existing images, if they have not already been provided.
+      if svg_images is None or png_images is None:
+         svg_images, png_images = self._scan_storage()
 
       # Check for errors (and add countries which are exceptions).
       svg_image_len = len(svg_images)
@@ -283,10 +360,21 @@ class NationFlagInformationLoader(InformationLoader):
       self.data = _image_paths_dict
       return self.data
 
-# Construct the nation flag information loader.
-nation_flag_info = NationFlagInformationLoader(
-   save_location = os.path.join(os.path.dirname(__file__), 'data', 'flag_data.pickle'))
-nation_flag_info.set_external_data(founding_dates = founding_dates,
-                                   storage_dir = os.path.join(os.path.dirname(__file__), 'flag_image_storage'))
+@functools.lru_cache(maxsize = 1)
+def get_nation_flag_info():
+   """Constructs the nation flag information loader (along with the founding dates which it needs)."""
+   founding_dates = get_founding_dates() # Also creates the data directory.
+   nation_flag_info = NationFlagInformationLoader(save_location = os.path.join(_DATA_DIR, 'flag_data.pickle'))
+   nation_flag_info.set_external_data(founding_dates = founding_dates,
+                                      storage_dir = os.path.join(os.path.dirname(__file__), 'flag_image_storage'))
+   return nation_flag_info
+
+def __getattr__(name):
+   # Construct the nation data lazily, rather than at import.
+   if name == 'founding_dates':
+      return get_founding_dates()
+   if name == 'nation_flag_info':
+      return get_nation_flag_info()
+   raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -19,94 +19,122 @@ A standalone implementation containing visualizations of presidents' executive o
 Everything within this file is mostly self-contained, meaning that it is not reliant on
 anything else within the `presidents` module, although it makes use of the `query` module.
 """
+import io
 import os
-import re
-import wikipedia as wk
+import time
+import functools
 
 # Webpage parsing functions.
-import requests
-from bs4 import BeautifulSoup
+import pandas as pd
+
+from query import _SESSION
+from query import BASE_WIKI_URL
+from query import InformationLoader
 
 # For figure development.
 import numpy as np
-import matplotlib
-from matplotlib import style
-style.use('fivethirtyeight')
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatch
-from matplotlib.lines import Line2D
+
+# The saved executive order data (next to this module), and how long it is kept before being re-parsed.
+_EXECUTIVE_ORDERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'executive_orders.pickle')
+_EXECUTIVE_ORDERS_MAX_AGE = 7 * 24 * 60 * 60
 
 def get_list_of_executive_orders():
    """Returns a list of executive orders by president."""
-   # Construct the webpage.
-   page = requests.get(wk.page('List of United States federal executive orders', auto_suggest=False).url)
-   soup = BeautifulSoup(page.content, 'html.parser')
-
-   # Create the list of orders.
-   executive_orders = {}
-
-   # Find all <tr> tags and parse table content.
-   main_table = soup.find('table', class_ = re.compile('wikitable'))
-   for row in main_table.find_all('tr'):
-      # Create a tracker list (to get a president/executive orders combo).
-      _tracker_list = []
-
-      # Parse over each row.
-      for indx, item in enumerate(row.find_all('td')):
-         # Notable instances which need to be skipped.
-         if item.text.strip() in ['Sources:']:
-            continue
-
-         # Get the president's name.
-         if indx == 1:
-            _tracker_list.append(item.text.strip())
-
-         # Get the number of executive orders.
-         if indx == 3:
-            _tracker_list.append(int(re.sub(',', '', item.text.strip())))
-
-         # Get the average number of executive orders per year and break.
-         if indx == 5:
-            _tracker_list.append(float(re.sub(',', '', item.text.strip())))
-            break
-
-      # Add the tracked list to the main dictionary and clear it.
-      if len(_tracker_list) == 3:
-         executive_orders[_tracker_list[0]] = [_tracker_list[1], _tracker_list[1] / _tracker_list[2]]
-      del _tracker_list
+   # Construct the webpage (the page URL is requested directly, rather than
+   # resolved through the Wikipedia API, to save a round-trip).
+   page = _SESSION.get(BASE_WIKI_URL + 'List_of_United_States_federal_executive_orders', timeout = 10)
+   page.raise_for_status()
+
+   # Parse main table content (the table of every president's orders, which is
+   # selected while the page is parsed, in a single pass).
+   table = pd.read_html(io.StringIO(page.text), match = 'George Washington')[0]
+   return _parse_executive_order_table(table)
+
+def _parse_executive_order_table(table):
+   """Parses the table of executive orders into a dictionary of the executive orders by president."""
+   # Get the president's name, the number of executive orders, and the average number of
+   # executive orders per year. Rows without valid numbers (e.g. the sources) are skipped.
+   names = table.iloc[:, 1].astype(str).str.strip()
+   orders = pd.to_numeric(table.iloc[:, 3].astype(str).str.replace(',', '', regex = False), errors = 'coerce')
+   averages = pd.to_numeric(table.iloc[:, 5].astype(str).str.replace(',', '', regex = False), errors = 'coerce')
+   keep = orders.notna() & averages.notna()
+   orders = orders[keep].astype(int)
+   years_in_office = orders / averages[keep]
+
+   # Construct the dictionary of orders (and the number of years in office).
+   executive_orders = {name: [total, years] for name, total, years
+                       in zip(names[keep], orders.tolist(), years_in_office.tolist())}
 
    # Return the list of parties.
    return executive_orders
 
-# Construct the dictionary mapping a president to an executive order.
-president_executive_orders = get_list_of_executive_orders()
+# Construct the information loader for executive order data.
+class ExecutiveOrderInformationLoader(InformationLoader):
+   def process_function(self):
+      """Constructs the dictionary mapping a president to their executive orders."""
+      return get_list_of_executive_orders()
+
+@functools.lru_cache(maxsize = 1)
+def get_president_executive_orders():
+   """Constructs the dictionary mapping a president to their executive orders, either from the saved
+   file or by parsing it. The saved file is re-parsed once it is more than a week old."""
+   os.makedirs(os.path.dirname(_EXECUTIVE_ORDERS_PATH), exist_ok = True)
+   is_stale = (os.path.exists(_EXECUTIVE_ORDERS_PATH) and
+               time.time() - os.path.getmtime(_EXECUTIVE_ORDERS_PATH) > _EXECUTIVE_ORDERS_MAX_AGE)
+   executive_order_info = ExecutiveOrderInformationLoader(
+      save_location = _EXECUTIVE_ORDERS_PATH, overwrite_data = is_stale)
+   with executive_order_info as data:
+      return data
+
+def __getattr__(name):
+   # Construct the dictionary mapping a president to an executive order lazily, rather than at import.
+   if name == 'president_executive_orders':
+      return get_president_executive_orders()
+   raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _construct_line_collection(x, y, color, linewidth):
+   """Constructs a line collection with a segment between each consecutive pair of points."""
+   from matplotlib.collections import LineCollection
+   points = np.column_stack([x, y]).astype(float)
+   segments = np.stack([points[:-1], points[1:]], axis = 1)
+   return LineCollection(segments, colors = color, linewidths = linewidth, capstyle = 'butt')
 
 def plot_executive_orders_per_president(save_figure = True):
    """Plots a line graph containing the executive orders per president."""
-   # Construct the x-axis, y-axis, and x-axis labels.
-   x_axis = list(range(1, len(president_executive_orders.keys()) + 1))
-   x_axis_labels = list(president_executive_orders.keys())
-   y_axis_1 = [item[0] for item in president_executive_orders.values()]
-   y_axis_2 = [item[1] for item in president_executive_orders.values()]
-
-   # Insert a 0 value in the x and y axis in order to maintain continuity in the graph.
-   x_axis.insert(0, 0)
-   x_axis_labels.insert(0, '')
-   y_axis_1.insert(0, 0)
-   y_axis_2.insert(0, 0)
+   # Matplotlib is only imported once a figure is actually being created.
+   import matplotlib.pyplot as plt
+   import matplotlib.patches as mpatch
+   from matplotlib.lines import Line2D
+
+   # Get the dictionary mapping a president to an executive order.
+   president_executive_orders = get_president_executive_orders()
+
+   # Construct the x-axis, y-axis, and x-axis labels. A 0 value is inserted at the start
+   # of the x and y axis in order to maintain continuity in the graph.
+   num_presidents = len(president_executive_orders)
+   x_axis = np.arange(num_presidents + 1)
+   x_axis_labels = [''] + list(president_executive_orders.keys())
+   y_axes = np.zeros((num_presidents + 1, 2))
+   y_axes[1:] = np.fromiter((value for pair in president_executive_orders.values() for value in pair),
+                            dtype = float, count = 2 * num_presidents).reshape(-1, 2)
+   y_axis_1, y_axis_2 = y_axes[:, 0], y_axes[:, 1]
 
    # Create the first plot (of the total number of orders).
    fig, ax1 = plt.subplots(figsize = (20, 5))
    plt.title("$\\bf{Executive\\,\\:Orders\\,\\:By\\,\\:President\\,\\:}$")
 
-   # Plot the data.
-   ax1.plot(x_axis, y_axis_1, color = 'tab:cyan')
+   # Plot the data (as a collection of solid segments, rather than a single line).
+   ax1.add_collection(_construct_line_collection(
+      x_axis, y_axis_1, color = 'tab:cyan', linewidth = plt.rcParams['lines.linewidth']))
+   ax1.autoscale_view()
 
    # Create the second plot (of the average number of orders per year).
    ax2 = ax1.twinx()
 
    # Plot the data.
-   ax2.plot(x_axis, y_axis_2, color = 'tab:green')
+   ax2.add_collection(_construct_line_collection(
+      x_axis, y_axis_2, color = 'tab:green', linewidth = plt.rcParams['lines.linewidth']))
+   ax2.autoscale_view()
 
    # Add the important events backgrounds/legend.
    plt.axvspan(15.5, 19.25, facecolor = 'tomato', alpha = 0.5)
@@ -126,7 +154,7 @@ def plot_executive_orders_per_president(save_figure = True):
    ax1.set_ylabel(r'Total Number of Executive Orders ', fontsize = 10,)
 
    # Set the x-axis.
-   plt.xlim(0.5, len(president_executive_orders.keys()))
+   plt.xlim(0.5, num_presidents)
    for ax in (ax1, ax2):
       plt.sca(ax)
       plt.xticks(x_axis, x_axis_labels, fontsize = 10, rotation = 45, ha = 'right')
@@ -162,5 +190,8 @@ def plot_executive_orders_per_president(save_figure = True):
    if save_figure:
       savefig.savefig('images/us-president-executive-orders.png')
 
-plot_executive_orders_per_president()
+if __name__ == '__main__':
+   from matplotlib import style
+   style.use('fivethirtyeight')
+   plot_executive_orders_per_president()
 
@@ -15,183 +15,189 @@
 # limitations under the License.
 import re
 import datetime
-import wikipedia as wk
+try:
+   import re2
+except ImportError:
+   re2 = None
 
-# Webpage parsing functions.
-import requests
-from bs4 import BeautifulSoup
+import lxml.etree
 
 from query import process_page
 from query import _pretty_parse
+from query import _fetch_page_tree
+from query import _FIRST_WIKITABLE_XPATH
 
 # Top-Level Conversion Dictionaries.
-_MONTH_TO_ABBREVIATION = {'January': 'Jan', 'February': 'Feb', 'March': 'Mar',
-                          'April': 'Apr', 'May': 'May', 'June': 'Jun', 'July': 'Jul',
-                          'August': 'Aug', 'September': 'Sep', 'October': 'Oct',
-                          'November': 'Nov', 'December': 'Dec'}
+_MONTH_NUM = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+              'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+# The patterns to parse for dates (Month Day, Year) and for links/footnotes. The date
+# pattern is matched against every term, so it uses the linear-time RE2 engine if available.
+_DATE_REGEX_ENGINE = re2 if re2 is not None else re
+_DATE_SEARCH_PATTERN = _DATE_REGEX_ENGINE.compile("(?P<month>Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
+                                                  "Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
+                                                  "Dec(?:ember)?)\\s(?P<day>\\d{1,2}),\\s(?P<year>\\d{4})")
+_LINK_PATTERN = re.compile('\\[(.*?)\\]')
+
+# The patterns to parse for the contents of a parenthetical (which may contain nested
+# parentheses), and for a year (to find the parenthetical containing a president's life dates).
+_PARENTHETICAL_PATTERN = re.compile('(?<=\\()(?:[^()]+|\\([^)]+\\))+')
+_YEAR_PATTERN = re.compile('\\b\\d{4}\\b')
+
+# Precompiled XPath selecting the person infobox of a parsed Wikipedia page.
+_INFOBOX_XPATH = lxml.etree.XPath('(//table[contains(@class, "infobox vcard")])[1]')
+
+# The patterns and translation table for cleaning up infobox content.
+_IN_OFFICE_PATTERN = re.compile('(?:In office)')
+_SPACING_PATTERN = re.compile('(^ )(A-Z)')
+_TRANS = str.maketrans({'\xa0': ' ', '\u200b': '', '\n': ', '})
+
+def _parse_office_term(term):
+   """Parses the text of a term in office into a list of datetime objects (empty if there is no valid term)."""
+   # Sometimes the term might contain runaway information, so we need to parse
+   # for these certain cases (essentially look for a valid term).
+   # Get rid of any links, then parse for start and end month/years
+   # (creating datetime objects directly from the month, day, and year).
+   term = _LINK_PATTERN.sub('', term)
+   _candidate_term = [datetime.datetime(int(date.group('year')), _MONTH_NUM[date.group('month')[:3]], int(date.group('day')))
+                      for date in _DATE_SEARCH_PATTERN.finditer(term)]
+   if len(_candidate_term) == 0:
+      return _candidate_term
+
+   # If the end year is empty, that's because the president is an incumbent.
+   # In that case, simply add the current date to the candidate list.
+   if len(_candidate_term) == 1:
+      # Get today's date (at midnight, as with the other dates).
+      _candidate_term.append(datetime.datetime.combine(datetime.date.today(), datetime.time()))
+
+   return _candidate_term
+
+def _parse_life_dates(president, introduction):
+   """Parses the plain-text introduction of a president's page into a list of their birth and death
+   datetime objects, from the first parenthetical containing a year (e.g. '(February 22, 1732 – ...)')."""
+   # The page introduction might be empty (e.g. for a missing page), or be missing the
+   # parenthetical with the dates, in which case there is nothing which can be parsed.
+   for parenthetical in _PARENTHETICAL_PATTERN.findall(introduction):
+      if _YEAR_PATTERN.search(parenthetical):
+         break
+   else:
+      parenthetical = ''
+   life_dates = [datetime.datetime(int(date.group('year')), _MONTH_NUM[date.group('month')[:3]], int(date.group('day')))
+                 for date in _DATE_SEARCH_PATTERN.finditer(parenthetical)]
+   if len(life_dates) == 0:
+      raise ValueError(f"Could not find the birth and death dates of {president} in the introduction of "
+                       f"their Wikipedia page (received {introduction[:100]!r}).")
+
+   # If the death date is empty, that's because the president is living.
+   # In that case, simply add the current date to the list.
+   if len(life_dates) == 1:
+      # Get today's date (at midnight, as with the other dates).
+      life_dates.append(datetime.datetime.combine(datetime.date.today(), datetime.time()))
+
+   return life_dates
 
 # Construct the processing function for US Presidents.
-def us_president_processing_function(term):
-   """The US Presidents list processing function (for usage in the process_page method)."""
+def us_president_table_processing_function(term):
+   """The US Presidents list processing function (for usage in the process_page method), which
+   returns the lists of presidents, their political parties, and their terms in office."""
    # Construct webpage.
-   page = requests.get(wk.page(term, auto_suggest = False).url)
-   soup = BeautifulSoup(page.content, 'html.parser')
+   tree = _fetch_page_tree(term)
 
-   # Create the list of presidents.
+   # Create the lists of presidents, political party affiliations, and terms in office.
    us_presidents = []
-
-   # Find all <b> tags and parse table content.
-   table = soup.find('table', class_ = re.compile('wikitable'))
-   for item in table.find_all('b'):
-      # Notable instances which need to be skipped.
-      if item.text.strip() in ['Sources:']:
-         continue
-
-      # Add to list of presidents.
-      us_presidents.append(item.text.strip())
-
-   # Return the list of presidents.
-   return us_presidents
-
-# Construct list of presidents.
-presidents = process_page('us presidents', processing_function = us_president_processing_function)
-
-# Construct the processing function for US Presidents' Political Parties.
-def us_president_political_parties_processing_function(term):
-   """The US Presidents political parties processing function (for usage in the process_page method)."""
-   # Construct webpage.
-   page = requests.get(wk.page(term, auto_suggest = False).url)
-   soup = BeautifulSoup(page.content, 'html.parser')
-
-   # Create the list of political party affiliations.
    political_parties = []
-
-   # Find all <tr> tags and parse table content.
-   main_table = soup.find('table', class_ = re.compile('wikitable'))
-   for row in main_table.find_all('tr'):
-      for indx, item in enumerate(row.find_all('td')):
-         # Notable instances which need to be skipped.
-         if item.text.strip() in ['Sources:']:
-            continue
-
-         # The fourth index contains the party, add it to the list.
-         if indx == 4:
-            political_parties.append(re.sub('\\[(.*?)\\]', '', item.text.strip()))
-
-   # Return the list of parties.
-   return political_parties
-
-# Construct the list of presidential political parties.
-president_parties = process_page('us presidents', processing_function = us_president_political_parties_processing_function)
-
-# Construct the processing function for US Presidents' Term in Office.
-def us_president_office_term_processing_function(term):
-   """The US Presidents term in office processing function (for usage in the process_page method)."""
-   # Construct webpage.
-   page = requests.get(wk.page(term, auto_suggest = False).url)
-   soup = BeautifulSoup(page.content, 'html.parser')
-
-   # Create the list of terms in office.
    office_terms = []
 
-   # Find all <tr> tags and parse table content.
-   main_table = soup.find('table', class_ = re.compile('wikitable'))
-   for row in main_table.find_all('tr'):
-      for indx, item in enumerate(row.find_all('td')):
+   # Find all <b> and <tr> tags and parse table content, in a single pass over the table.
+   main_table = _FIRST_WIKITABLE_XPATH(tree)[0]
+   for element in main_table.iter('b', 'tr'):
+      # The <b> tags contain the presidents' names.
+      if element.tag == 'b':
          # Notable instances which need to be skipped.
-         if item.text.strip() in ['Sources:']:
+         text = element.text_content().strip()
+         if text == 'Sources:':
             continue
 
-         # The first index contains the term, add it to the list.
-         if indx == 0:
-            # However, sometimes the first term might contain runaway information, so
-            # we need to parse for these certain cases (essentially look for a valid term).
-            _date_search_pattern = re.compile("(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|"
-                                              "Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|"
-                                              "Dec(?:ember)?)\\s\\d{1,2},\\s\\d{4}")
-            if len(re.findall(_date_search_pattern, item.text.strip())) > 0:
-               # Get rid of any links.
-               term = re.sub('\\[(.*?)\\]', '', item.text.strip())
-
-               # Create the candidate list.
-               _candidate_term = []
-
-               # Create a candidate list of pre-parsed dates.
-               _pre_parsed_dates = []
-
-               # Parse for start and end month/years.
-               for date in re.finditer(_date_search_pattern, term):
-                  _pre_parsed_dates.append(date.group())
-
-               # Convert terms to datetime objects..
-               for date_pattern in _pre_parsed_dates:
-                  # Parse the date pattern into a datetime objects.
-                  date_objects = [i[:-1] if i[-1] == ',' else i for i in date_pattern.split(' ')]
-
-                  # Convert the month into an abbreviation.
-                  date_objects[0] = _MONTH_TO_ABBREVIATION[date_objects[0]]
-
-                  # Create a datetime object from the list.
-                  date_obj = datetime.datetime.strptime(' '.join(date_objects), "%b %d %Y")
+         # Add to list of presidents.
+         us_presidents.append(text)
+         continue
 
-                  # Add to candidate term list.
-                  _candidate_term.append(date_obj)
+      # Otherwise, parse the <td> tags of the row. Only the term (first index) and the
+      # party (fourth index) columns are used, so index them directly.
+      cells = list(element.iter('td'))
 
-               # If the end year is empty, that's because the president is an incumbent.
-               # In that case, simply add the current date to the candidate list.
-               if len(_pre_parsed_dates) == 1:
-                  # Get today's date in month/day/year.
-                  _candidate_term.append(datetime.datetime.strptime(
-                     datetime.datetime.today().strftime("%b %d %Y"), "%b %d %Y"))
+      # The first index contains the term, add it to the list (notable instances,
+      # such as the sources, contain no valid term and so are skipped).
+      if len(cells) > 0:
+         _candidate_term = _parse_office_term(cells[0].text_content().strip())
+         if len(_candidate_term) > 0:
+            office_terms.append(_candidate_term)
 
-               # Add the candidate list to the main list.
-               office_terms.append(_candidate_term)
+      # The fourth index contains the party, add it to the list.
+      if len(cells) > 4:
+         party = cells[4].text_content().strip()
+         if party != 'Sources:':
+            political_parties.append(_LINK_PATTERN.sub('', party))
 
-   # Return the list of terms.
-   return office_terms
+   # Return the lists of presidents, parties, and terms.
+   return us_presidents, political_parties, office_terms
 
-# Construct the list of presidents' terms in office.
-president_office_terms = process_page('us presidents', processing_function = us_president_office_term_processing_function)
+# Construct the lists of presidents, their political parties, and their terms in office.
+presidents, president_parties, president_office_terms = process_page(
+   'us presidents', processing_function = us_president_table_processing_function)
 
 # Other useful methods:
 
 def us_president_infobox_processing_function(term):
    """The US Presidents infobox processing function, returns a dictionary containing
    semi-processed information about a President (from the Wikipedia person infobox)."""
-   # Construct webpage.
-   page = requests.get(wk.page(term, auto_suggest = False).url)
-   soup = BeautifulSoup(page.content, 'html.parser')
+   # Construct webpage (shared between the processing functions).
+   tree = _fetch_page_tree(term)
 
    # Create the list of presidents.
    label_dict = {}
 
-   # Find all <th> and <td> tags and parse table content.
-   table = soup.find('table', class_ = re.compile('infobox vcard'))
-   label_list = table.find_all('th'); label_list.insert(0, 'Name')
-   for label, item in zip(label_list, table.find_all('td')):
+   # Find all <tr> tags and parse the <th> and <td> content of each row, in a single pass.
+   table = _INFOBOX_XPATH(tree)[0]
+   for row in table.iter('tr'):
+      # Get the label and the item of the row.
+      label = row.find('th')
+      item = row.find('td')
+      if item is None:
+         continue
+
       # Skip if item contains no information.
-      if item.text.strip() == '':
+      item = item.text_content().strip()
+      if item == '':
          continue
 
-      # Parse item text.
-      item = item.text.strip()
+      # Rows without a label: the first item is the name, and the terms in office are
+      # kept under an 'In office' label (any other unlabelled rows, e.g. images, are skipped).
+      if label is None:
+         if _IN_OFFICE_PATTERN.search(item):
+            label = 'In office'
+         elif len(label_dict) == 0:
+            label = 'Name'
+         else:
+            continue
+
       # Remove "In Office" from the strings.
-      item = re.sub('(?:In office)', '', item)
-      # Remove the non-breaking space character.
-      item = item.replace(u'\xa0', u' ')
-      # Remove the zero-width space character.
-      item = item.replace(u'\u200b', u'')
+      item = _IN_OFFICE_PATTERN.sub('', item)
+      # Remove the non-breaking and zero-width space characters, and convert
+      # newlines to commas (for a list comprehension), in a single pass.
+      item = item.translate(_TRANS)
       # Add spaces between words when necessary.
-      item = re.sub('(^ )(A-Z)', ' ', item)
-      # Convert newlines to commas (for a list comprehension).
-      item = re.sub('\n', ', ', item)
+      item = _SPACING_PATTERN.sub(' ', item)
       # Wikipedia pretty-parse item.
       item = _pretty_parse(item)
 
       if isinstance(label, str):
-         label_dict[label.strip()] = item
+         # A president may have held office for several terms, so these are all kept.
+         if label in label_dict and label == 'In office':
+            item = f'{label_dict[label]}; {item}'
+         label_dict[label] = item
       else:
-         label_dict[label.text.strip()] = item
+         label_dict[label.text_content().strip()] = item
 
    # Return the list of presidents.
    return label_dict
@@ -22,30 +22,46 @@ directories as an API-searching and information processing resource.
 
 import os
 import sys
+import time
+import atexit
 import re
 import abc
-import copy
 import logging
 import pickle
-import inspect
+import shelve
+import itertools
+import functools
+import threading
+import concurrent.futures
 
 # Wikipedia API.
 import wikipedia as wk
 
 # Webpage Parsing Modules.
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+import lxml.html
+import lxml.etree
+try:
+   import orjson
+except ImportError:
+   orjson = None
 
 # Country Processing Modules.
 import pycountry as pc
 
 
 # Top-Level Resource Lists: Updated in the validation methods below.
-_SUPPORTED_LIST_QUERIES = []
+_SUPPORTED_LIST_HANDLERS = {'us presidents': 'List of presidents of the United States',
+                            'sovereign states formation': 'List of sovereign states by dates of formation'}
 _REPLACEMENT_QUERIES = []
+_REPLACEMENT_INDEX = {}
 _ALLOWED_SPACED_QUERIES = []
+_ALLOWED_SPACED_QUERIES_SET = frozenset()
 _NATION_DICT = {}
-_VALIDATED_CACHE = {}
+_NATION_ALIAS_SET = frozenset()
+_NATION_ALIAS_TO_INDEX = {}
 
 
 # Additional Constants.
@@ -53,6 +69,52 @@ BASE_WIKI_URL = "https://en.wikipedia.org/wiki/"
 BASE_WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
 BASE_WIKI_REQUEST_URL = 'http://en.wikipedia.org/w/api.php?action=query&prop=pageimages&format=json&piprop=original&titles='
 
+# Shared HTTP session, so that connections to Wikipedia are pooled and kept alive. Every request
+# identifies the project through a descriptive User-Agent, as the Wikimedia API etiquette asks.
+_USER_AGENT = 'history-visualized/1.0 (https://github.com/amogh7joshi/history-visualized)'
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections = 4, pool_maxsize = 8))
+_SESSION.headers.update({'User-Agent': _USER_AGENT, 'Accept-Encoding': 'gzip, deflate'})
+_PAGE_TREE_LOCKS = {}
+
+# On-disk caches of Wikipedia results, which persist them across runs. These are kept next to
+# this module (rather than in the working directory), so the same cache is used from anywhere.
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache')
+
+# On-disk cache of Wikipedia search results, which are refreshed once they are more than a week old.
+_SEARCH_CACHE_PATH = os.path.join(_CACHE_DIR, 'search_cache')
+_SEARCH_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+# On-disk cache of summarized page information (opened on first use).
+_PAGE_CACHE_PATH = os.path.join(_CACHE_DIR, 'page_cache')
+_PAGE_CACHE_LOCK = threading.Lock()
+_PAGE_CACHE = None
+
+# Paragraphs which are skipped when summarizing page information.
+_SKIP_PARAGRAPHS = frozenset({'Sources:'})
+
+# The maximum number of results which the search API returns for a single request.
+_MAX_SEARCH_LIMIT = 500
+
+# Sentinel which marks calls to list_of_search_results made from within this module.
+_INTERNAL = object()
+
+# Pre-resolved URLs of frequently fetched pages, which skips the Wikipedia API round-trip to resolve them.
+_URL_OVERRIDES = {
+   'List of presidents of the United States': BASE_WIKI_URL + 'List_of_presidents_of_the_United_States',
+}
+
+# Precompiled pattern for prettifying Wikipedia page content in a single pass: it matches
+# footnote links, periods (along with any footnote links directly after them), newlines,
+# and non-ASCII characters, each of which is then replaced by _pretty_parse_replacement.
+_RE_PRETTY_PARSE = re.compile(r'(?P<footnote>\[.{0,3}\])|(?P<period>\.(?:\[.{0,3}\])*)'
+                              r'|(?P<newline>\n)|(?P<non_ascii>[^\x00-\x7F]+)')
+_PRETTY_PARSE_REPLACEMENTS = {'footnote': '', 'newline': ', ', 'non_ascii': ''}
+
+# Precompiled XPath selecting the first 'wikitable' on a parsed Wikipedia page.
+_FIRST_WIKITABLE_XPATH = lxml.etree.XPath('(//table[contains(@class, "wikitable")])[1]')
+
 
 # GENERATION METHODS:
 # Internal methods to construct the above resource lists and dictionaries.
@@ -72,8 +134,7 @@ def _generate_nation_dict():
          country_official_name = item.name
 
       # Create a sub-list.
-      _sublist = list({country_name, country_official_name, item.alpha_2, item.alpha_3})
-      _sublist = [it.lower() for it in _sublist]
+      _sublist = [it.lower() for it in (country_name, country_official_name, item.alpha_2, item.alpha_3)]
 
       # Manual additions as necessary.
       if country_official_name == 'Brunei Darussalam':
@@ -85,12 +146,20 @@ def _generate_nation_dict():
       if country_official_name == 'Cabo Verde':
          _sublist.append('cape verde')
 
-      # Append to dictionary.
-      _NATION_DICT[indx] = _sublist
+      # Append to dictionary (deduplicated in order and interned, as an immutable tuple).
+      _NATION_DICT[indx] = tuple(sys.intern(it) for it in dict.fromkeys(_sublist))
 
    # Add a manual item.
-   _NATION_DICT[indx + 1] = ['East Timor']
-   _NATION_DICT[indx + 2] = ['Timor-Leste']
+   _NATION_DICT[indx + 1] = ('East Timor',)
+   _NATION_DICT[indx + 2] = ('Timor-Leste',)
+
+   # Construct the reverse lookups (from every alias to its nation), so that aliases can
+   # be validated and matched to their nation without scanning the entire dictionary.
+   global _NATION_ALIAS_SET, _NATION_ALIAS_TO_INDEX
+   _NATION_ALIAS_SET = frozenset(itertools.chain.from_iterable(_NATION_DICT.values()))
+   for indx, _sublist in _NATION_DICT.items():
+      for alias in _sublist:
+         _NATION_ALIAS_TO_INDEX.setdefault(alias, indx)
 
 
 def _generate_replacement_queries():
@@ -101,6 +170,12 @@ def _generate_replacement_queries():
    _REPLACEMENT_QUERIES.append(['nation', 'country', 'countries', 'nations', 'sovereign states'])
    _REPLACEMENT_QUERIES.append(['president', 'presidents', 'prime minister', 'prime ministers'])
 
+   # Construct the reverse lookup (from every query to its replacement queries).
+   global _REPLACEMENT_INDEX
+   for _query_matches in _REPLACEMENT_QUERIES:
+      for query in _query_matches:
+         _REPLACEMENT_INDEX.setdefault(query, _query_matches)
+
 
 def _generate_allowed_spaced_queries():
    """Generates the _ALLOWED_SPACED_QUERIES list."""
@@ -110,9 +185,14 @@ def _generate_allowed_spaced_queries():
    _ALLOWED_SPACED_QUERIES.extend(['prime minister', 'prime ministers'])
    _ALLOWED_SPACED_QUERIES.extend(['united states'])
 
+   # Construct the set of queries for membership checks.
+   global _ALLOWED_SPACED_QUERIES_SET
+   _ALLOWED_SPACED_QUERIES_SET = frozenset(_ALLOWED_SPACED_QUERIES)
+
 
-def _generate_resources():
-   """Generates the resource lists before anything gets imported."""
+@functools.lru_cache(maxsize = 1)
+def _ensure_resources():
+   """Generates the resource lists on first use (only once), rather than whenever the module is imported."""
    # Generate list of nations and relevant codes.
    _generate_nation_dict()
    # Generate list of replacement queries.
@@ -136,31 +216,69 @@ def get_base_path_name(file):
 
 def is_valid_country(term):
    """Determines if an input nation is a valid nation."""
-   # Construct a cache so we don't have to perform a dictionary comprehension every time.
-   global _VALIDATED_CACHE
    try:
-      term = term.lower()
+      term = sys.intern(term.lower())
    except TypeError:
       return False # If the input is not a string.
    except AttributeError:
       return False # If the input is not a string.
 
-   # Iterate over dictionary's values.
-   for value in _NATION_DICT.values():
-      if term in value:
-         # If term is valid, add it to the cache and return it.
-         _VALIDATED_CACHE[term] = True
-         return _VALIDATED_CACHE[term]
-
-   # Otherwise, set it to False and return it.
-   _VALIDATED_CACHE[term] = False
-   return _VALIDATED_CACHE[term]
+   # Look up the term in the set of every nation alias.
+   _ensure_resources()
+   return term in _NATION_ALIAS_SET
 
 
 # WIKIPEDIA API INTERACTION METHODS:
 # These methods conduct the actual searching of the Wikipedia API.
 
 
+def _wiki_api_query(**params):
+   """Returns the result of a MediaWiki API query, through the shared session."""
+   response = _SESSION.get(BASE_WIKI_API_URL, params = {'action': 'query', 'format': 'json', **params}, timeout = 10)
+   response.raise_for_status()
+   json_data = orjson.loads(response.content) if orjson is not None else response.json()
+   return json_data['query']
+
+
+def _wiki_api_search(query, limit):
+   """Returns the titles of the Wikipedia search results for a query, through the shared session."""
+   json_data = _wiki_api_query(list = 'search', srprop = '', srsearch = query,
+                               srlimit = min(limit, _MAX_SEARCH_LIMIT))
+   return tuple(item['title'] for item in json_data['search'])
+
+
+def _page_revision_id(term):
+   """Returns the id of the latest revision of a Wikipedia page (or None if there is no such page)."""
+   json_data = _wiki_api_query(prop = 'revisions', rvprop = 'ids', redirects = 1, titles = term)
+   revisions = next(iter(json_data['pages'].values())).get('revisions')
+   return revisions[0]['revid'] if revisions else None
+
+
+@functools.lru_cache(maxsize = 4096)
+def _cached_wk_search(term, results):
+   """Returns the Wikipedia search results for a term, cached in memory and on disk."""
+   _cache_key = f'{term.lower()}|{results}'
+   os.makedirs(_CACHE_DIR, exist_ok = True)
+
+   # Check whether the results have already been saved from a (recent) previous run.
+   with _SEARCH_CACHE_LOCK, shelve.open(_SEARCH_CACHE_PATH) as cache:
+      entry = cache.get(_cache_key)
+   if entry is not None and time.time() - entry[0] < _SEARCH_CACHE_MAX_AGE:
+      return entry[1]
+
+   # Otherwise, search for the term and save the results (along with when they were searched).
+   output = _wiki_api_search(term, results)
+   with _SEARCH_CACHE_LOCK, shelve.open(_SEARCH_CACHE_PATH) as cache:
+      cache[_cache_key] = (time.time(), output)
+   return output
+
+
+@functools.lru_cache(maxsize = 256)
+def _cached_page_url(term):
+   """Returns the URL of a (disambiguation-free) Wikipedia page, which is stable and so cached."""
+   return wk.page(term, auto_suggest = False).url
+
+
 def _merge_query_results(*terms, output_thresh = 20):
    """Converts provided query terms into a list of outputs."""
    # Construct list of outputs.
@@ -171,15 +289,8 @@ def _merge_query_results(*terms, output_thresh = 20):
       if not isinstance(term, str):
          raise TypeError(f"Received invalid term {term} of type {type(term)}.")
 
-      # Get search query.
-      try:
-         _search_query = term.lower() # Reduce issues with case-sensitivity.
-         _output_items = wk.search(term, results = output_thresh)
-      finally:
-         del _search_query
-
-      # Add output to results.
-      output_values.extend(_output_items)
+      # Get search query and add output to results (the search cache is case-insensitive).
+      output_values.extend(_cached_wk_search(term, output_thresh))
 
    # Return results.
    return output_values
@@ -188,135 +299,88 @@ def _merge_query_results(*terms, output_thresh = 20):
 def search_multiple_words(*words, output_thresh = 20):
    """Gets the output result of multiple words and returns values which contain each input term."""
    if len(words) == 1: # If there is only one search query.
-      return wk.search(words[0], results = output_thresh)
+      return list(_cached_wk_search(words[0], output_thresh))
 
    # Get complete list of outputs.
    complete_output = _merge_query_results(*words, output_thresh = output_thresh)
-   _tracker_output = [word.lower() for word in complete_output] # For actual tracking.
+   _folded_words = tuple(word.casefold() for word in words)
 
-   # Create list of final outputs.
-   final_output = []
+   # Filter list of outputs for those which contain every search query.
+   return [output for output in complete_output
+           if all(word in output.casefold() for word in _folded_words)]
 
-   # Filter list of outputs.
-   for _lower_output, output in zip(_tracker_output, complete_output):
-      # Set tracker.
-      _track = True
 
-      # Iterate over search queries.
-      for term in words:
-         _term = term.lower() # Convert term to lowercase.
-         if _term not in _lower_output:
-            # One term is missing from output.
-            _track = False
+def _search_alternative_query(terms):
+   """Returns the list of search result items for one alternative version of a query."""
+   return list_of_search_results(*terms, _internal_caller = _INTERNAL)
 
-      # Add to final output list.
-      if _track:
-         final_output.append(output)
 
-   # Return final outputs.
-   return final_output
+def _search_alternative_queries(alternative_terms):
+   """Gathers the search results of each alternative version of a query (e.g. each of a
+   nation's names), with the searches being run concurrently since they are I/O-bound."""
+   with concurrent.futures.ThreadPoolExecutor(max_workers = 8) as executor:
+      _results = list(executor.map(_search_alternative_query, alternative_terms))
+
+   # Construct the final output list (in the same order as the alternative queries).
+   _output = []
+   for _result in _results:
+      _output.extend(_result)
+   return _output
 
 
 def _parse_query_for_conditions(*terms, **kwargs):
    """Certain queries have allotted replacements which need to all be tried."""
+   _ensure_resources()
+
    # Determine if one of the provided terms is a nation.
-   global _NATION_DICT
-   _filter_terms = list(copy.deepcopy(terms))
-   for term in _filter_terms:
-      # Iterate over _NATION_DICT.
-      for _value_pair in _NATION_DICT.values():
-         if term in _value_pair:
-            # Remove the code from the list.
-            _filter_terms.remove(term)
-
-            # If term is a nation, then gather a list of all possible outputs for
-            # each possible version of the nation's name.
-            _output = []
-            for _nation_code in _value_pair:
-               # Replace the index of the code with a different code.
-               _filter_terms.append(_nation_code)
-
-               # Add the list of result items to the current output list.
-               _output.extend(list_of_search_results(*_filter_terms, bypass=False))
-
-               # Remove the index code.
-               _filter_terms.remove(_nation_code)
-
-            # Return the final output list.
-            return _output
+   for indx, term in enumerate(terms):
+      if term in _NATION_ALIAS_TO_INDEX:
+         # If term is a nation, then gather a list of all possible outputs for
+         # each possible version of the nation's name (in place of the term).
+         _other_terms = terms[:indx] + terms[indx + 1:]
+         return _search_alternative_queries(
+            [_other_terms + (_nation_code,) for _nation_code in _NATION_DICT[_NATION_ALIAS_TO_INDEX[term]]])
 
    # Determine if one of the provided terms is a replaceable term.
    if 'skip_replacement_queries' not in kwargs:
-      global _REPLACEMENT_QUERIES
-      _filter_terms = list(copy.deepcopy(terms))
-      for term in _filter_terms:
-         # Iterate over _REPLACEMENT_QUERIES.
-         for _query_matches in _REPLACEMENT_QUERIES:
-            if term in _query_matches:
-               # Remove the replaceable term from the list.
-               _filter_terms.remove(term)
-
-               # If the term is replaceable, then gather a list of all possible outputs for
-               # each of the different replacement queries.
-               _output = []
-               for _generated_query in _query_matches:
-                  # Replace the index of the term with a different term.
-                  _filter_terms.append(_generated_query)
-
-                  # Add the list of result items to the current output list.
-                  _output.extend(list_of_search_results(*_filter_terms, bypass=False))
-
-                  # Remove the index term.
-                  _filter_terms.remove(_generated_query)
-
-               # Return the final output list.
-               return _output
+      for indx, term in enumerate(terms):
+         if term in _REPLACEMENT_INDEX:
+            # If the term is replaceable, then gather a list of all possible outputs for
+            # each of the different replacement queries (in place of the term).
+            _other_terms = terms[:indx] + terms[indx + 1:]
+            return _search_alternative_queries(
+               [_other_terms + (_generated_query,) for _generated_query in _REPLACEMENT_INDEX[term]])
 
    # If nothing has been returned, then return the original method.
-   return list_of_search_results(*terms, bypass = False)
+   return list_of_search_results(*terms, _internal_caller = _INTERNAL)
 
 
-def list_of_search_results(*terms, bypass = True, **kwargs):
+def list_of_search_results(*terms, _internal_caller = None, **kwargs):
    """Returns a list of search result items from a specific query, such as 'list of nations'."""
-   # The bypass argument should only be changed by this function itself.
-   # Determine if it is changed by the user.
-   if not bypass:
-      # Get current and outer frame.
-      current_frame = inspect.currentframe()
-      call_frame = inspect.getouterframes(current_frame, 2)
-      if call_frame[1][3] not in ['list_of_search_results', '_parse_query_for_conditions']:
-         raise PermissionError("The `bypass` keyword argument was changed by an external function, which "
-                               "should never be done. Edit your code to leave the argument unchanged. ")
-
-   # See if the provided term has multiple words.
-   _validation_list = list(copy.deepcopy(terms))
-   terms = []
-   for term in _validation_list:
-      global _ALLOWED_SPACED_QUERIES
-      if " " in term and term not in _ALLOWED_SPACED_QUERIES:
-         terms.extend(term.split(' '))
+   # The _internal_caller argument should only be set by the methods in this module, which
+   # pass the private _INTERNAL sentinel. Determine if it is changed by the user.
+   if _internal_caller is not None and _internal_caller is not _INTERNAL:
+      raise PermissionError("The `_internal_caller` keyword argument was changed by an external function, which "
+                            "should never be done. Edit your code to leave the argument unchanged. ")
+   bypass = _internal_caller is None
+   _ensure_resources()
+
+   # See if the provided term has multiple words (the strings are immutable, so the
+   # original terms can be iterated over directly while the new list is built).
+   _split_terms = []
+   for term in terms:
+      if " " in term and term not in _ALLOWED_SPACED_QUERIES_SET:
+         _split_terms.extend(term.split(' '))
       else:
-         terms.append(term)
+         _split_terms.append(term)
+   terms = _split_terms
 
    # Parse for certain conditions.
    if bypass:
       return _parse_query_for_conditions(*terms, **kwargs)
 
-   # Either have a list of terms, or a single term.
-   if len(terms) == 1:
-      # Get an output list of query terms.
-      try:
-         _query_term = terms[0].lower() # Reduce issues with case-sensitivity.
-         output_list = search_multiple_words(_query_term, 'list', output_thresh = 100)
-      finally:
-         del _query_term
-   else:
-      # Get an output list of query terms.
-      try:
-         _query_terms = [term.lower() for term in terms] # Reduce issues with case-sensitivity.
-         output_list = search_multiple_words(*_query_terms, 'list', output_thresh = 100)
-      finally:
-         del _query_terms
+   # Get an output list of query terms (lowercased to reduce issues with case-sensitivity).
+   output_list = search_multiple_words(*[term.lower() for term in terms], 'list', output_thresh = 100)
 
    # Return the list of query terms (filtered for uniqueness).
    return list(set(output_list))
@@ -326,34 +390,28 @@ def process_page(*search_terms, specific_query = None, processing_function = Non
    """Returns the result of a search, such as 'list of countries', from a given processing function.
    Uses a provided processing function, so it must be overwritten for a specific purpose."""
    # Determine whether the search term is supported (e.g. has a special case).
-   global _SUPPORTED_LIST_QUERIES
-   _SUPPORTED_LIST_QUERIES = ['us presidents', 'sovereign states formation']
    for search_term in search_terms:
-      if search_term in _SUPPORTED_LIST_QUERIES:
-         if search_term == 'us presidents':
-            # Special case of U.S. Presidents.
-            return processing_function('List of presidents of the United States')
-         if search_term == 'sovereign states formation':
-            # Special case of Sovereign States by Formation.
-            return processing_function('List of sovereign states by dates of formation')
+      page = _SUPPORTED_LIST_HANDLERS.get(search_term)
+      if page:
+         return processing_function(page)
 
    # Get the Wikipedia pages.
    # There might be multiple lists, so this option allows to search for a specific list.
    if specific_query:
+      _valid_list = None
+      _specific_query_folded = specific_query.casefold()
       for _check_list in list_of_search_results(*search_terms, skip_replacement_queries = True):
          # Parse for a substring.
          if specific_query in _check_list:
             _valid_list = _check_list
             break
-         # Parse for a complete string.
-         if specific_query.lower() == _check_list.lower():
+         # Parse for a complete string (only strings of the same length can match).
+         if len(_check_list) == len(specific_query) and _specific_query_folded == _check_list.casefold():
             _valid_list = _check_list
             break
 
       # Determine if a result exists.
-      try:
-         _x = _valid_list
-      except:
+      if _valid_list is None:
          _valid_list = list_of_search_results(*search_terms, skip_replacement_queries = True)
    else:
       # Otherwise, just use the first list result.
@@ -368,63 +426,107 @@ def process_page(*search_terms, specific_query = None, processing_function = Non
    return processing_function(_valid_list)
 
 
-def _pretty_parse(item):
-   """Prettifies an inputted string containing Wikipedia page content."""
-   if not isinstance(item, str):
-      raise TypeError(f"Expected a string containing Wikipedia page content, got {type(item)}")
-
-   # Remove all header/footer links from page.
-   item = re.sub('\\[.{0,3}\\]', '', item)
-
-   # Add spaces after periods if necessary.
-   item = re.sub('\\.(?!\\s|$|"|\')', '. ', item)
-
-   # Turn escaped apostrophes into literal apostrophes.
-   item = item.replace("\'", "'")
+def _fetch_page_tree(term):
+   """Returns the parsed HTML tree of a Wikipedia page (fetching and parsing each page only once)."""
+   # Concurrent callers wait on the first fetch of a page rather than duplicating it
+   # (different pages are fetched and parsed in parallel, lxml releases the GIL while parsing).
+   with _PAGE_TREE_LOCKS.setdefault(term, threading.Lock()):
+      return _cached_page_tree(term)
 
-   # Remove \u200 unicode characters.
-   item = re.sub(r'[^\x00-\x7F]+', '', item)
 
-   # Turn newlines into commas and spaces.
-   item = re.sub('\n', ', ', item)
+@functools.lru_cache(maxsize = 32)
+def _cached_page_tree(term):
+   """Fetches and parses the HTML tree of a Wikipedia page."""
+   # The (decompressed) response body is streamed into the parser, rather than
+   # being read into memory in full first.
+   page_url = _URL_OVERRIDES.get(term) or _cached_page_url(term)
+   with _SESSION.get(page_url, stream = True, timeout = 10) as page:
+      page.raise_for_status()
+      page.raw.decode_content = True
+      return lxml.html.parse(page.raw).getroot()
 
-   return item
 
+def _pretty_parse(item):
+   """Prettifies an inputted string containing Wikipedia page content."""
+   if not isinstance(item, str):
+      raise TypeError(f"Expected a string containing Wikipedia page content, got {type(item)}")
 
-def parse_page_information(term, summarize = False):
-   """Returns the page information from a parsed term."""
+   # Remove all header/footer links from page, add spaces after periods if necessary,
+   # remove \u200 unicode characters, and turn newlines into commas and spaces.
+   return _RE_PRETTY_PARSE.sub(_pretty_parse_replacement, item)
+
+
+def _pretty_parse_replacement(match):
+   """Returns the replacement for a match of the single-pass _pretty_parse pattern."""
+   if match.lastgroup == 'period':
+      # Only add a space if the period (and its footnote links) is followed by
+      # anything other than whitespace, quotes, or the end of the content.
+      following = match.string[match.end():match.end() + 1]
+      if following == '' or following.isspace() or following in '"\'':
+         return '.'
+      return '. '
+   return _PRETTY_PARSE_REPLACEMENTS[match.lastgroup]
+
+
+def _get_page_cache():
+   """Returns the on-disk cache of summarized page information, opening it on first use."""
+   global _PAGE_CACHE
+   if _PAGE_CACHE is None:
+      os.makedirs(_CACHE_DIR, exist_ok = True)
+      _PAGE_CACHE = shelve.open(_PAGE_CACHE_PATH)
+      atexit.register(_PAGE_CACHE.close)
+   return _PAGE_CACHE
+
+
+def parse_page_information(term, summarize = False, force_refresh = False):
+   """Returns the page information from a parsed term. Summarized page information is cached on
+   disk along with the page revision, so it is only re-parsed from Wikipedia once the page has been
+   edited (or if `force_refresh` is set)."""
    if not isinstance(term, str):
       raise TypeError("You must provide a pre-parsed string to get the page information, if you are searching "
                       "using an arbitrary term then you need to get the specific term first.")
 
+   # Return the cached summarized information, if it exists for the current revision of the page.
+   if summarize:
+      revision = _page_revision_id(term)
+      if not force_refresh:
+         with _PAGE_CACHE_LOCK:
+            entry = _get_page_cache().get(term)
+         if entry is not None and entry[0] == revision:
+            return entry[1]
+
    # Get the specific page URL.
    try:
-      page_url = wk.page(term, auto_suggest = False).url
+      page_url = _cached_page_url(term)
    except wk.DisambiguationError:
       raise ValueError("Arrived at a Wikipedia disambiguation. Try again with a pre-parsed specific term.")
    except Exception as e:
       raise e
 
-   # Get the page content from the URL.
-   page = requests.get(page_url)
-   soup = BeautifulSoup(page.content, 'html.parser')
+   # Get the page content from the URL (through the shared session, parsed with lxml).
+   page = _SESSION.get(page_url, timeout = 10)
+   soup = BeautifulSoup(page.content, 'lxml')
 
    # Set up the string containing the complete description.
    if summarize:
-      complete_information = ""
+      parts = []
 
       # Get all of the paragraph content in the page.
-      table = soup.find('div', class_ = re.compile('mw-content-ltr'))
+      table = soup.select_one('div.mw-content-ltr')
       for item in table.find_all('p'):
          # Notable instances which need to be skipped.
-         if item.text.strip() in ['Sources:']:
+         text = item.text.strip()
+         if text in _SKIP_PARAGRAPHS:
             continue
 
-         # Add to list of presidents.
-         complete_information += item.text.strip()
+         # Add to list of paragraphs.
+         parts.append(text)
 
-      # Parse and prettify the content before returning.
-      return _pretty_parse(complete_information)
+      # Parse and prettify the content, and cache it before returning.
+      complete_information = _pretty_parse(''.join(parts))
+      with _PAGE_CACHE_LOCK:
+         _get_page_cache()[term] = (revision, complete_information)
+      return complete_information
 
    # If no summarization is requested, return the BeautifulSoup object.
    return soup
@@ -504,10 +606,10 @@ class InformationLoader(object, metaclass = abc.ABCMeta):
       try:
          if not os.path.exists(self.save_location):
             with open(self.save_location, 'wb') as save_file:
-               pickle.dump(self.data, save_file)
+               pickle.dump(self.data, save_file, protocol = pickle.HIGHEST_PROTOCOL)
          elif os.path.exists(self.save_location) and self.overwrite_data:
             with open(self.save_location, 'wb') as save_file:
-               pickle.dump(self.data, save_file)
+               pickle.dump(self.data, save_file, protocol = pickle.HIGHEST_PROTOCOL)
       except Exception as e:
          raise e
 
@@ -546,7 +648,7 @@ if __name__ == '__main__':
    logging.warning("You are now directly running the query file. Unless you are debugging, do not edit this file.")
 
    # Configure global resource lists.
-   _generate_resources()
+   _ensure_resources()
 
    # WORKING CODE HERE:
    print(list_of_search_results('nations', 'formation'))
@@ -555,7 +657,7 @@ else:
    # Set up logging configuration for the InformationLoader class.
    logging.basicConfig(format = '%(levelname)s - %(name)s: %(message)s')
 
-   # Otherwise, something is being imported. In that case, initialize the global resource lists.
-   _generate_resources()
+   # Otherwise, something is being imported. In that case, the global resource lists are
+   # initialized lazily, the first time that one of the query methods needs them.
 
 
@@ -0,0 +1,31 @@
+import os
+import sys
+import importlib
+
+import pytest
+
+# The modules are imported relative to the repository root (e.g. `from query import ...`).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Saved Wikipedia content which the parsing functions are tested against.
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def presidents_info(monkeypatch):
+    """Imports presidents.info without fetching the list of presidents from Wikipedia."""
+    for module in ('wikipedia', 'requests', 'bs4', 'lxml', 'pycountry'):
+        pytest.importorskip(module)
+    query = importlib.import_module('query')
+    monkeypatch.setattr(query, 'process_page', lambda *args, **kwargs: ([], [], []))
+    monkeypatch.delitem(sys.modules, 'presidents.info', raising = False)
+    return importlib.import_module('presidents.info')
+
+
+@pytest.fixture
+def presidents_dates(presidents_info, monkeypatch):
+    """Imports presidents.dates (on top of the offline presidents.info) without any page requests."""
+    for module in ('numpy', 'matplotlib', 'dateutil'):
+        pytest.importorskip(module)
+    monkeypatch.delitem(sys.modules, 'presidents.dates', raising = False)
+    return importlib.import_module('presidents.dates')
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+lxml_html = pytest.importorskip('lxml.html')
+pytest.importorskip('geopandas')
+pytest.importorskip('wikipedia')
+
+from conftest import FIXTURE_DIR
+from cities.population import parse_city_table
+
+_FIXTURE = os.path.join(FIXTURE_DIR, 'us_city_table.html')
+
+
+def _read_fixture_table():
+    with open(_FIXTURE, encoding = 'utf-8') as fixture:
+        return lxml_html.fromstring(fixture.read())
+
+
+def test_parse_city_table_reads_hidden_geo_span():
+    cities = parse_city_table(_read_fixture_table())
+    assert cities[['Latitude', 'Longitude']].notna().all().all()
+    assert cities[['Latitude', 'Longitude']].to_numpy().tolist() == [[40.66, -73.94], [34.02, -118.41]]
+
+
+def test_parse_city_table_keeps_columns_aligned():
+    # The footnote row (which has a <td>, but no population or location) is skipped.
+    cities = parse_city_table(_read_fixture_table())
+    assert cities[['Name', 'State', 'Population']].values.tolist() == [
+        ['New York', 'New York', 8258035], ['Los Angeles', 'California', 3820914]]
@@ -0,0 +1,23 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+for _module in ('numpy', 'wikipedia', 'requests', 'bs4', 'lxml', 'pycountry'):
+    pytest.importorskip(_module)
+
+from presidents.executive_orders import _parse_executive_order_table
+
+
+def test_parse_executive_order_table():
+    table = pd.DataFrame({
+        '#': ['1', '32', ''],
+        'President': ['George Washington ', 'Franklin D. Roosevelt', 'Sources'],
+        'Party': ['Unaffiliated', 'Democratic', ''],
+        'Total executive orders': ['8', '3,721', '—'],
+        'Years in office': ['7.85', '12.1', ''],
+        'Average per year': ['1', '307.5', '—'],
+    })
+    # The thousands separators are removed, the source row is skipped, and
+    # the years in office are computed from the totals and the averages.
+    executive_orders = _parse_executive_order_table(table)
+    assert executive_orders == {'George Washington': [8, 8.0],
+                                'Franklin D. Roosevelt': [3721, pytest.approx(3721 / 307.5)]}
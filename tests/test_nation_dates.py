@@ -0,0 +1,16 @@
+import datetime
+
+import pytest
+
+for _module in ('numpy', 'cv2', 'matplotlib', 'aiohttp', 'tqdm', 'cairo', 'cairosvg',
+                'wikipedia', 'requests', 'bs4', 'lxml', 'pycountry'):
+    pytest.importorskip(_module)
+
+from nations.dates import convert_dates_to_date_objects
+
+
+def test_convert_dates_to_date_objects():
+    # Founding years are converted to datetime objects at the start of the year.
+    assert convert_dates_to_date_objects({'France': '1789', 'Egypt': '1922', 'Iceland': '0874'}) == {
+        'France': datetime.datetime(1789, 1, 1), 'Egypt': datetime.datetime(1922, 1, 1),
+        'Iceland': datetime.datetime(874, 1, 1)}
@@ -0,0 +1,68 @@
+import os
+import json
+import datetime
+
+import pytest
+
+from conftest import FIXTURE_DIR
+
+with open(os.path.join(FIXTURE_DIR, 'president_extracts.json'), encoding = 'utf-8') as fixture:
+    _EXTRACTS = json.load(fixture)
+
+
+@pytest.mark.parametrize('president, expected', [
+    ('George Washington', [datetime.datetime(1732, 2, 22), datetime.datetime(1799, 12, 14)]),
+    ('Dwight D. Eisenhower', [datetime.datetime(1890, 10, 14), datetime.datetime(1969, 3, 28)]),
+    ('Jimmy Carter', [datetime.datetime(1924, 10, 1), datetime.datetime(2024, 12, 29)]),
+])
+def test_parse_life_dates(presidents_info, president, expected):
+    assert presidents_info._parse_life_dates(president, _EXTRACTS[president]) == expected
+
+
+def test_parse_life_dates_living_president_ends_today(presidents_info):
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    assert presidents_info._parse_life_dates('Joe Biden', _EXTRACTS['Joe Biden']) == [
+        datetime.datetime(1942, 11, 20), today]
+
+
+@pytest.mark.parametrize('introduction', ['', 'George Washington was the first president (of many).'])
+def test_parse_life_dates_without_dates_raises(presidents_info, introduction):
+    with pytest.raises(ValueError, match = 'George Washington'):
+        presidents_info._parse_life_dates('George Washington', introduction)
+
+
+def _reference_term_bar_lengths(office_terms):
+    # The original loop: a president is boosted by the next president's short term (the incumbent by
+    # their own), and the president after a boosted president is reduced, unless boosted themselves.
+    term_lengths, tracker = [], None
+    for indx, term in enumerate(office_terms):
+        term_length = term[1].year - term[0].year
+        lookahead = term if indx == 0 else office_terms[indx + 1] if indx < len(office_terms) - 1 else None
+        if lookahead is not None and lookahead[1].year - lookahead[0].year < 1:
+            delta = (lookahead[1].month - lookahead[0].month + 1) / 12
+            term_length += delta
+            tracker = [indx + 1, delta]
+        if tracker is not None and tracker[0] == indx:
+            term_length -= tracker[1]
+            tracker = None
+        term_lengths.append(term_length)
+    return term_lengths
+
+
+def _term(start, end):
+    return [datetime.datetime(*start), datetime.datetime(*end)]
+
+
+@pytest.mark.parametrize('office_terms', [
+    # Short terms in the middle (e.g. William Henry Harrison), ordered from the latest president.
+    [_term((1849, 3, 4), (1850, 7, 9)), _term((1845, 3, 4), (1849, 3, 4)), _term((1841, 4, 4), (1845, 3, 4)),
+     _term((1841, 3, 4), (1841, 4, 4)), _term((1837, 3, 4), (1841, 3, 4)), _term((1829, 3, 4), (1837, 3, 4))],
+    # An incumbent president who has been in office for less than one year.
+    [_term((2025, 1, 20), (2025, 10, 15)), _term((2021, 1, 20), (2025, 1, 20)), _term((2017, 1, 20), (2021, 1, 20))],
+    # Consecutive short terms.
+    [_term((1900, 1, 1), (1904, 1, 1)), _term((1899, 5, 1), (1899, 9, 1)), _term((1899, 1, 1), (1899, 4, 1)),
+     _term((1890, 1, 1), (1899, 1, 1)), _term((1880, 1, 1), (1890, 1, 1))],
+])
+def test_term_bar_lengths_matches_loop(presidents_dates, office_terms):
+    assert presidents_dates._term_bar_lengths(office_terms).tolist() == pytest.approx(
+        _reference_term_bar_lengths(office_terms))
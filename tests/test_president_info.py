@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+lxml_html = pytest.importorskip('lxml.html')
+
+from conftest import FIXTURE_DIR
+
+_FIXTURE = os.path.join(FIXTURE_DIR, 'president_infobox.html')
+
+
+def test_infobox_processing_function_labels_rows(presidents_info, monkeypatch):
+    with open(_FIXTURE, encoding = 'utf-8') as fixture:
+        tree = lxml_html.fromstring(fixture.read())
+    monkeypatch.setattr(presidents_info, '_fetch_page_tree', lambda term: tree)
+
+    # The first unlabelled row is the name (the image and caption rows are skipped), and
+    # every term in office is kept (the en dashes are removed by the pretty-parse).
+    assert presidents_info.us_president_infobox_processing_function('George Washington') == {
+        'Name': 'George Washington',
+        'In office': 'April 30, 1789  March 4, 1797; July 13, 1798  December 14, 1799',
+        'Vice President': 'John Adams',
+    }
@@ -0,0 +1,64 @@
+import re
+import random
+
+import pytest
+
+for _module in ('wikipedia', 'requests', 'bs4', 'lxml', 'pycountry'):
+    pytest.importorskip(_module)
+
+import query
+
+# Canned search results for each individual search term (keyed on the lowercased term).
+_SEARCH_RESULTS = {
+    'nation': ('List of nation states', 'Nation', 'Nation state'),
+    'country': ('List of countries', 'Country music'),
+    'countries': ('List of countries by area', 'Countries'),
+    'nations': ('List of nations', 'United Nations'),
+    'sovereign': ('List of sovereign states', 'Sovereign'),
+    'states': ('List of sovereign states', 'States of Germany', 'List of states'),
+    'list': ('List of sovereign states', 'List of countries', 'List of nations', 'Lists'),
+}
+
+
+def _fake_search(term, results):
+    return _SEARCH_RESULTS.get(term.lower(), ())
+
+
+def test_list_of_search_results_merges_each_term(monkeypatch):
+    # Each term is searched on its own, and the results which contain every word are kept.
+    monkeypatch.setattr(query, '_cached_wk_search', _fake_search)
+    assert set(query.list_of_search_results('nations')) == {
+        'List of nation states', 'List of nations', 'List of countries',
+        'List of countries by area', 'List of sovereign states'}
+
+
+# The original (multi-pass) _pretty_parse, which the single-pass version must match.
+_RE_FOOTNOTE = re.compile('\\[.{0,3}\\]')
+_RE_PERIOD = re.compile('\\.(?!\\s|$|"|\')')
+_RE_NON_ASCII = re.compile(r'[^\x00-\x7F]+')
+_RE_NEWLINE = re.compile('\n')
+
+
+def _reference_pretty_parse(item):
+    item = _RE_FOOTNOTE.sub('', item)
+    item = _RE_PERIOD.sub('. ', item)
+    item = item.replace("\'", "'")
+    item = _RE_NON_ASCII.sub('', item)
+    return _RE_NEWLINE.sub(', ', item)
+
+
+@pytest.mark.parametrize('item, expected', [
+    ('Washington.[1] He was the first president.', 'Washington. He was the first president.'),
+    ('U.S. president[a]\nGeneral', 'U. S. president, General'),
+    ('He said "hi."\u200b', 'He said "hi."'),
+])
+def test_pretty_parse(item, expected):
+    assert query._pretty_parse(item) == expected
+
+
+def test_pretty_parse_matches_multi_pass_version():
+    generator = random.Random(0)
+    alphabet = '.[]a "\'\n1é\u200b'
+    for _ in range(20000):
+        item = ''.join(generator.choice(alphabet) for _ in range(generator.randint(0, 12)))
+        assert query._pretty_parse(item) == _reference_pretty_parse(item), repr(item)
@@ -0,0 +1,18 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+for _module in ('matplotlib', 'wikipedia', 'requests', 'bs4', 'lxml', 'pycountry'):
+    pytest.importorskip(_module)
+
+from macroeconomics.world_money import _parse_gwp_table
+
+
+def test_parse_gwp_table():
+    table = pd.DataFrame({
+        'Year': ['2000', '1 AD[3]', '1000 BC', '10,000 BC', 'Sources:', '5000 BC'],
+        'GWP': ['41,016.69 (est.)', '18.5[4]', '4.6', '2.6', 'Maddison', 'n/a'],
+    })
+    # The years before 9999 BC, the source row, and the rows without a GWP value are dropped,
+    # and the data is reversed (to go from earliest to latest).
+    gwp_data = _parse_gwp_table(table)
+    assert list(gwp_data.items()) == [('1000 B.C.', 4.6), ('1 A.D.', 18.5), ('2000', 41016.69)]
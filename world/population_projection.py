@@ -31,26 +31,31 @@ def get_population_estimates():
    # Construct the path to the file.
    file_path = os.path.join(
       os.path.dirname(__file__), 'data', 'historical-and-projected-population-by-region.csv')
-   # Read in the file.
-   df = pd.read_csv(file_path)
+   # Read in the file (only the columns which are actually used). The parsed data is
+   # cached to a parquet file, which is used for as long as it is newer than the csv file.
+   parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+   if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+      df = pd.read_parquet(parquet_path)
+   else:
+      df = pd.read_csv(file_path, engine = 'c',
+                       usecols = lambda column: column in ('Entity', 'Year') or 'Population' in column,
+                       dtype = {'Entity': 'category', 'Year': 'int32'})
+      df.to_parquet(parquet_path)
 
    # Select the columns containing the world's projections.
    world_data = df.loc[df['Entity'] == 'World']
 
    # Find the column containing the word "population" and choose that.
-   population_column = None
-   for column in world_data.columns:
-      if "Population" in str(column):
-         population_column = column
-         break
+   population_column = next(column for column in world_data.columns if "Population" in str(column))
 
    # Select the `Year` column and turn it into an array.
-   years = np.array(world_data['Year'])
+   years = world_data['Year'].to_numpy()
    # Select the `Population` column and turn it into an array.
-   population = np.array(world_data[population_column])
+   population = world_data[population_column].to_numpy()
 
-   # Shrink the data to the period 1800-2100 as opposed to -10000-2100.
-   shrink_value = int(np.where(years == 1800)[0])
+   # Shrink the data to the period 1800-2100 as opposed to -10000-2100
+   # (the years are sorted, so the start can be found with a binary search).
+   shrink_value = np.searchsorted(years, 1800)
    years = years[shrink_value:]
    population = population[shrink_value:]
 